@@ -1,29 +1,151 @@
 """ADB helper utilities used by ContractBot."""
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import logging
+import re
+import struct
 import subprocess
+import threading
 import time
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:  # pragma: no cover - optional dependency guards
+    import numpy as np
+except ImportError:  # pragma: no cover - runtime guard
+    np = None  # type: ignore[assignment]
 
 
 class AdbError(RuntimeError):
     """Raised when an ADB command fails."""
 
 
+#: Cached ``adb devices`` output as ``(monotonic_timestamp, devices)``.
+#: Device lists change rarely, so repeated enumeration within the TTL
+#: would just fork redundant ``adb`` processes.
+_device_cache: Optional[Tuple[float, List[Tuple[str, str]]]] = None
+_DEVICE_CACHE_TTL = 5.0
+
+#: Matches one ready device line of ``adb devices -l`` output in a single
+#: pass, replacing per-line strip/split/substring checks.
+_DEVICES_RE = re.compile(r"^(\S+)\s+(device\b[^\n]*)$", re.M)
+
+
+@dataclass(frozen=True)
+class TapStep:
+    x: int
+    y: int
+    delay: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class SwipeStep:
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    duration_ms: int = 300
+    delay: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class SleepStep:
+    seconds: float
+
+
+@dataclass(frozen=True)
+class ShellStep:
+    command: str
+    delay: Optional[float] = None
+
+
+#: A precompiled UI automation step, dispatched on type in execute_steps.
+UiStep = Union[TapStep, SwipeStep, SleepStep, ShellStep]
+
+
+def compile_steps(steps: Sequence[Dict[str, Any]]) -> Tuple[UiStep, ...]:
+    """Normalise raw JSON UI steps into typed step objects.
+
+    Doing the dict lookups and int conversions once at load time keeps
+    the per-invocation cost of :meth:`ADBClient.execute_steps` to a type
+    dispatch, and surfaces malformed coordinates at startup instead of
+    mid-automation.
+    """
+
+    compiled: List[UiStep] = []
+    for idx, step in enumerate(steps):
+        action = (step.get("action") or step.get("type") or "").lower()
+        if action == "tap":
+            compiled.append(
+                TapStep(int(step["x"]), int(step["y"]), step.get("delay"))
+            )
+        elif action == "swipe":
+            compiled.append(
+                SwipeStep(
+                    int(step["x1"]),
+                    int(step["y1"]),
+                    int(step["x2"]),
+                    int(step["y2"]),
+                    int(step.get("duration_ms", 300)),
+                    step.get("delay"),
+                )
+            )
+        elif action == "sleep":
+            compiled.append(
+                SleepStep(float(step.get("seconds", step.get("duration", 0))))
+            )
+        elif action == "shell":
+            command = step.get("command")
+            if not isinstance(command, str):
+                command = " ".join(command or [])
+            compiled.append(ShellStep(command, step.get("delay")))
+        else:
+            logging.warning(
+                "Skipping malformed UI step %s: %s", idx, step
+            )
+    return tuple(compiled)
+
+
 class ADBClient:
     """Thin wrapper around the ``adb`` binary."""
 
     def __init__(self, serial: str) -> None:
         self.serial = serial
+        self._base_cmd: Tuple[str, ...] = (
+            ("adb",) if not serial or serial == "auto" else ("adb", "-s", serial)
+        )
+        self._shell: Optional[subprocess.Popen] = None
+        self._shell_lock = threading.Lock()
+        # Reusable screenshot buffer: a 1080p RGBA frame is ~8 MB, so
+        # allocating a fresh bytes object per capture churns the allocator.
+        # The buffer is grown on demand and its contents are only valid
+        # until the next screencap call.
+        self._shot_buf = bytearray(16 + 4 * 1920 * 1080)
+        #: Touchscreen metadata for sendevent taps, populated by
+        #: :meth:`enable_sendevent`: (device node, max_x, max_y, screen
+        #: width, screen height).  ``None`` keeps the ``input tap`` path.
+        self._touch: Optional[Tuple[str, int, int, int, int]] = None
 
     # ------------------------------------------------------------------
     # Device discovery
     # ------------------------------------------------------------------
 
     @staticmethod
-    def list_devices() -> List[Tuple[str, str]]:
-        """Return a list of connected ``adb`` devices."""
+    def list_devices(force_refresh: bool = False) -> List[Tuple[str, str]]:
+        """Return a list of connected ``adb`` devices.
+
+        Results are cached for a few seconds; pass ``force_refresh=True``
+        to bypass the cache and re-run device enumeration.
+        """
+
+        global _device_cache
+        if not force_refresh and _device_cache is not None:
+            timestamp, cached = _device_cache
+            if time.monotonic() - timestamp < _DEVICE_CACHE_TTL:
+                return list(cached)
 
         try:
             result = subprocess.run(
@@ -36,18 +158,11 @@ class ADBClient:
         except FileNotFoundError as exc:  # pragma: no cover - runtime guard
             raise AdbError("adb binary not found in PATH") from exc
 
-        devices: List[Tuple[str, str]] = []
-        for line in result.stdout.splitlines()[1:]:
-            line = line.strip()
-            if not line:
-                continue
-            parts = line.split(maxsplit=1)
-            if len(parts) == 1:
-                serial, desc = parts[0], ""
-            else:
-                serial, desc = parts[0], parts[1]
-            if "device" in desc:
-                devices.append((serial, desc))
+        devices = [
+            (match.group(1), match.group(2).strip())
+            for match in _DEVICES_RE.finditer(result.stdout)
+        ]
+        _device_cache = (time.monotonic(), devices)
         return devices
 
     @staticmethod
@@ -73,12 +188,22 @@ class ADBClient:
     # ------------------------------------------------------------------
 
     def _adb_base_command(self) -> List[str]:
-        if not self.serial or self.serial == "auto":
-            return ["adb"]
-        return ["adb", "-s", self.serial]
+        return list(self._base_cmd)
+
+    def run(
+        self,
+        *args: str,
+        timeout: Optional[float] = None,
+        text: bool = True,
+    ) -> subprocess.CompletedProcess:
+        """Run an ``adb`` command, raising :class:`AdbError` on failure.
 
-    def run(self, *args: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
-        command = self._adb_base_command() + list(args)
+        Callers that only care about the return code can pass
+        ``text=False`` to skip decoding potentially large stdout payloads;
+        stderr is still decoded, but only on the error path.
+        """
+
+        command = [*self._base_cmd, *args]
         logging.debug("Running ADB command: %s", command)
         try:
             result = subprocess.run(
@@ -86,44 +211,363 @@ class ADBClient:
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 check=True,
-                encoding="utf-8",
+                encoding="utf-8" if text else None,
                 timeout=timeout,
             )
         except subprocess.CalledProcessError as exc:
-            logging.error("ADB command failed: %s", exc.stderr.strip())
-            raise AdbError(exc.stderr.strip()) from exc
+            stderr = exc.stderr
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode("utf-8", "ignore")
+            logging.error("ADB command failed: %s", stderr.strip())
+            raise AdbError(stderr.strip()) from exc
         return result
 
+    @staticmethod
+    def _drain_stderr(
+        proc: subprocess.Popen,
+    ) -> Tuple[threading.Thread, List[bytes]]:
+        """Read *proc*'s stderr to EOF on a background thread.
+
+        Reading stdout to EOF while stderr sits unread is a pipe
+        deadlock: once the child fills the ~64 KiB stderr buffer it
+        blocks, never closes stdout, and both sides hang.  Join the
+        returned thread before using the collected chunks.
+        """
+
+        chunks: List[bytes] = []
+
+        def _drain() -> None:
+            assert proc.stderr is not None
+            try:
+                chunks.append(proc.stderr.read())
+            except Exception:  # pragma: no cover - pipe teardown race
+                pass
+
+        thread = threading.Thread(
+            target=_drain, name="adb-stderr", daemon=True
+        )
+        thread.start()
+        return thread, chunks
+
     def exec_out(
         self, *args: str, timeout: Optional[float] = None, binary: bool = True
     ) -> bytes:
-        command = self._adb_base_command() + ["exec-out"] + list(args)
+        """Run ``adb exec-out`` and return its raw stdout.
+
+        Reads the pipes directly so the multi-megabyte payload transfer
+        happens in C with the GIL released, letting the Discord thread
+        keep running while a screencap streams in; stderr is only decoded
+        on the error path.
+        """
+
+        command = [*self._base_cmd, "exec-out", *args]
         logging.debug("Running ADB exec-out: %s", command)
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                check=True,
-                timeout=timeout,
             )
-        except subprocess.CalledProcessError as exc:
-            logging.error(
-                "ADB exec-out failed: %s", exc.stderr.decode("utf-8", "ignore")
-            )
-            raise AdbError(exc.stderr.decode("utf-8", "ignore")) from exc
+        except FileNotFoundError as exc:  # pragma: no cover - runtime guard
+            raise AdbError("adb binary not found in PATH") from exc
+        assert proc.stdout is not None and proc.stderr is not None
+        drain, stderr_chunks = self._drain_stderr(proc)
+        # The blocking stdout read would outlive any deadline checked
+        # only afterwards, so the timeout is enforced by a timer that
+        # kills the child: the pipes then hit EOF and the reads return.
+        timed_out = threading.Event()
+        timer: Optional[threading.Timer] = None
+        if timeout is not None:
+
+            def _expire() -> None:
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(timeout, _expire)
+            timer.daemon = True
+            timer.start()
+        try:
+            stdout = proc.stdout.read()
+            proc.stdout.close()
+            returncode = proc.wait()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            drain.join()
+            proc.stderr.close()
+        if timed_out.is_set():
+            raise AdbError(f"ADB exec-out timed out: {' '.join(command)}")
+        if returncode != 0:
+            message = b"".join(stderr_chunks).decode("utf-8", "ignore").strip()
+            logging.error("ADB exec-out failed: %s", message)
+            raise AdbError(message)
         return (
-            result.stdout
+            stdout
             if binary
-            else result.stdout.decode("utf-8", "ignore").encode("utf-8")
+            else stdout.decode("utf-8", "ignore").encode("utf-8")
+        )
+
+    def exec_out_into(self, buf: bytearray, *args: str) -> int:
+        """Run ``adb exec-out`` reading stdout into *buf*; return byte count.
+
+        *buf* is grown as needed and reused across calls, so large
+        payloads (screenshots) avoid a fresh multi-megabyte allocation per
+        capture.  The caller must treat the contents as valid only until
+        the next call that writes into the same buffer.
+        """
+
+        command = [*self._base_cmd, "exec-out", *args]
+        logging.debug("Running ADB exec-out (buffered): %s", command)
+        try:
+            proc = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except FileNotFoundError as exc:  # pragma: no cover - runtime guard
+            raise AdbError("adb binary not found in PATH") from exc
+        assert proc.stdout is not None and proc.stderr is not None
+        drain, stderr_chunks = self._drain_stderr(proc)
+        total = 0
+        while True:
+            if total == len(buf):
+                buf += bytes(1 << 20)
+            view = memoryview(buf)[total:]
+            read = proc.stdout.readinto(view)
+            view.release()
+            if not read:
+                break
+            total += read
+        proc.stdout.close()
+        drain.join()
+        proc.stderr.close()
+        if proc.wait() != 0:
+            message = b"".join(stderr_chunks).decode("utf-8", "ignore").strip()
+            logging.error("ADB exec-out failed: %s", message)
+            raise AdbError(message)
+        return total
+
+    def run_many(
+        self,
+        commands: Sequence[Sequence[str]],
+        timeout: Optional[float] = None,
+    ) -> List[subprocess.CompletedProcess]:
+        """Run several independent ``adb`` commands concurrently.
+
+        Useful for fanning out over a device fleet or overlapping the
+        spawn latency of commands with no ordering dependency (e.g. a tap
+        plus an immediate screencap).  Results are returned in the order
+        of *commands*; the first failure raises :class:`AdbError` after
+        all commands have completed.
+        """
+
+        if not commands:
+            return []
+        if len(commands) == 1:
+            return [self.run(*commands[0], timeout=timeout)]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(4, len(commands))
+        ) as pool:
+            futures = [
+                pool.submit(self.run, *command, timeout=timeout)
+                for command in commands
+            ]
+            concurrent.futures.wait(futures)
+        return [future.result() for future in futures]
+
+    # ------------------------------------------------------------------
+    # Async command execution
+    # ------------------------------------------------------------------
+
+    async def arun(
+        self, *args: str, timeout: Optional[float] = None
+    ) -> subprocess.CompletedProcess:
+        """Async counterpart of :meth:`run` for callers on an event loop.
+
+        Blocking ADB calls otherwise pin a whole OS thread while the
+        Discord loop is running; this awaits the subprocess instead so
+        bot commands can drive the device without a thread hop.
+        """
+
+        command = [*self._base_cmd, *args]
+        logging.debug("Running async ADB command: %s", command)
+        stdout, stderr = await self._acommunicate(command, timeout)
+        return subprocess.CompletedProcess(
+            command,
+            0,
+            stdout.decode("utf-8", "ignore"),
+            stderr.decode("utf-8", "ignore"),
         )
 
+    async def aexec_out(
+        self, *args: str, timeout: Optional[float] = None
+    ) -> bytes:
+        """Async counterpart of :meth:`exec_out`."""
+
+        command = [*self._base_cmd, "exec-out", *args]
+        logging.debug("Running async ADB exec-out: %s", command)
+        stdout, _ = await self._acommunicate(command, timeout)
+        return stdout
+
+    async def ascreencap(self) -> Optional["Image.Image"]:
+        """Async counterpart of :meth:`screencap`."""
+
+        try:
+            from PIL import Image
+        except ImportError as exc:  # pragma: no cover - runtime guard
+            raise RuntimeError(
+                "Pillow is required for screenshot decoding but is not installed"
+            ) from exc
+
+        attempts = 0
+        while attempts < 3:
+            attempts += 1
+            try:
+                raw = await self.aexec_out("screencap")
+            except AdbError:
+                logging.warning("ADB screencap attempt %s failed", attempts)
+                await asyncio.sleep(1)
+                continue
+            image = self._decode_raw_screencap(raw, Image)
+            if image is not None:
+                return image
+            try:
+                raw = await self.aexec_out("screencap", "-p")
+                from io import BytesIO
+
+                image = Image.open(BytesIO(raw))
+                image.load()
+                return image
+            except Exception as exc:  # pragma: no cover - runtime guard
+                logging.warning(
+                    "Failed to decode screenshot (attempt %s): %s", attempts, exc
+                )
+                await asyncio.sleep(1)
+        logging.error("Unable to capture valid screenshot after retries")
+        return None
+
+    async def _acommunicate(
+        self, command: Sequence[str], timeout: Optional[float]
+    ) -> Tuple[bytes, bytes]:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as exc:  # pragma: no cover - runtime guard
+            raise AdbError("adb binary not found in PATH") from exc
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError as exc:
+            proc.kill()
+            await proc.wait()
+            raise AdbError(
+                f"ADB command timed out: {' '.join(command)}"
+            ) from exc
+        if proc.returncode != 0:
+            message = stderr.decode("utf-8", "ignore").strip()
+            logging.error("ADB command failed: %s", message)
+            raise AdbError(message)
+        return stdout, stderr
+
+    # ------------------------------------------------------------------
+    # Persistent shell session
+    # ------------------------------------------------------------------
+
+    def _ensure_shell(self) -> subprocess.Popen:
+        """Return a long-lived ``adb shell`` process, starting it if needed."""
+
+        if self._shell is None or self._shell.poll() is not None:
+            command = [*self._base_cmd, "shell"]
+            logging.debug("Starting persistent ADB shell: %s", command)
+            try:
+                self._shell = subprocess.Popen(
+                    command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    encoding="utf-8",
+                    errors="ignore",
+                )
+            except FileNotFoundError as exc:  # pragma: no cover - runtime guard
+                raise AdbError("adb binary not found in PATH") from exc
+        return self._shell
+
+    def shell_exec(self, command: str, timeout: Optional[float] = None) -> str:
+        """Run *command* inside the persistent shell session.
+
+        Each invocation of ``adb shell`` pays full transport/fork overhead,
+        which dominates scripted UI sequences.  Feeding commands to one
+        long-lived shell amortises that cost; a sentinel echo marks the end
+        of each command's output.
+        """
+
+        sentinel = f"__DONE_{uuid.uuid4().hex}__"
+        with self._shell_lock:
+            try:
+                shell = self._ensure_shell()
+                assert shell.stdin is not None and shell.stdout is not None
+                shell.stdin.write(f"{command}; echo {sentinel}\n")
+                shell.stdin.flush()
+                lines: List[str] = []
+                while True:
+                    line = shell.stdout.readline()
+                    if not line:
+                        raise AdbError("Persistent ADB shell closed unexpectedly")
+                    stripped = line.strip()
+                    if stripped.endswith(sentinel):
+                        prefix = stripped[: -len(sentinel)].rstrip()
+                        if prefix:
+                            lines.append(prefix)
+                        break
+                    lines.append(line.rstrip("\n"))
+                return "\n".join(lines)
+            except (AdbError, OSError, ValueError) as exc:
+                logging.warning(
+                    "Persistent ADB shell failed (%s); falling back to one-shot adb shell",
+                    exc,
+                )
+                self._close_shell()
+        result = self.run("shell", *command.split(), timeout=timeout)
+        return result.stdout.strip()
+
+    def _close_shell(self) -> None:
+        shell, self._shell = self._shell, None
+        if shell is None:
+            return
+        try:
+            if shell.stdin is not None:
+                shell.stdin.close()
+            shell.terminate()
+            shell.wait(timeout=2)
+        except Exception:  # pragma: no cover - best effort cleanup
+            logging.debug("Failed to terminate persistent ADB shell cleanly")
+
+    def close(self) -> None:
+        """Release resources held by the client."""
+
+        with self._shell_lock:
+            self._close_shell()
+
+    def __del__(self) -> None:  # pragma: no cover - interpreter shutdown
+        try:
+            self._close_shell()
+        except Exception:
+            pass
+
     # ------------------------------------------------------------------
     # High level helpers
     # ------------------------------------------------------------------
 
     def screencap(self) -> Optional["Image.Image"]:
-        """Capture a screenshot from the device."""
+        """Capture a screenshot from the device.
+
+        The fast path requests the raw framebuffer (``screencap`` without
+        ``-p``) and wraps it with :func:`PIL.Image.frombuffer`, skipping
+        PNG encode on the device and decode on the host entirely.  If the
+        raw header cannot be parsed the slower PNG path is used instead.
+        """
 
         try:
             from PIL import Image
@@ -136,12 +580,21 @@ class ADBClient:
         while attempts < 3:
             attempts += 1
             try:
-                raw = self.exec_out("screencap", "-p")
+                length = self.exec_out_into(self._shot_buf, "screencap")
             except AdbError:
                 logging.warning("ADB screencap attempt %s failed", attempts)
                 time.sleep(1)
                 continue
+            image = self._decode_raw_screencap(
+                memoryview(self._shot_buf)[:length], Image
+            )
+            if image is not None:
+                return image
+            logging.debug(
+                "Raw screencap header not recognised; falling back to PNG"
+            )
             try:
+                raw = self.exec_out("screencap", "-p")
                 from io import BytesIO
 
                 image = Image.open(BytesIO(raw))
@@ -155,42 +608,210 @@ class ADBClient:
         logging.error("Unable to capture valid screenshot after retries")
         return None
 
+    @staticmethod
+    def _decode_raw_screencap(
+        raw: Union[bytes, memoryview], image_module: Any
+    ) -> Optional["Image.Image"]:
+        """Decode the raw ``screencap`` framebuffer dump, if *raw* is one.
+
+        The dump starts with little-endian uint32 width, height and pixel
+        format, followed (on newer Android versions) by a colour-space
+        word, then tightly packed RGBA pixels.  Returns ``None`` when the
+        payload does not match the header so callers can fall back to PNG.
+        """
+
+        header = ADBClient._parse_raw_header(raw)
+        if header is None:
+            return None
+        width, height, header_size = header
+        return image_module.frombuffer(
+            "RGBA",
+            (width, height),
+            raw[header_size : header_size + width * height * 4],
+            "raw",
+            "RGBA",
+            0,
+            1,
+        )
+
+    @staticmethod
+    def _parse_raw_header(
+        raw: Union[bytes, memoryview]
+    ) -> Optional[Tuple[int, int, int]]:
+        """Return ``(width, height, header_size)`` for a raw framebuffer dump."""
+
+        if len(raw) < 12:
+            return None
+        width, height, pixel_format = struct.unpack_from("<3I", raw)
+        if not width or not height or width > 16384 or height > 16384:
+            return None
+        if pixel_format != 1:  # PIXEL_FORMAT_RGBA_8888
+            return None
+        expected = width * height * 4
+        for header_size in (16, 12):
+            if len(raw) >= header_size + expected:
+                return width, height, header_size
+        return None
+
+    def screencap_array(self) -> Optional["np.ndarray"]:
+        """Capture a screenshot as a numpy view over the raw framebuffer.
+
+        Downstream OCR only needs pixel data, so going through a PIL image
+        is one full-frame copy of pure overhead.  The returned array
+        aliases the internal screenshot buffer (shape ``(h, w, 4)`` RGBA)
+        and is valid only until the next capture.  Crops are plain numpy
+        slices; wrap with ``Image.fromarray`` only at the OCR boundary.
+        """
+
+        if np is None:
+            raise RuntimeError(
+                "numpy is required for screencap_array but is not installed"
+            )
+        attempts = 0
+        while attempts < 3:
+            attempts += 1
+            try:
+                length = self.exec_out_into(self._shot_buf, "screencap")
+            except AdbError:
+                logging.warning("ADB screencap attempt %s failed", attempts)
+                time.sleep(1)
+                continue
+            header = self._parse_raw_header(memoryview(self._shot_buf)[:length])
+            if header is None:
+                logging.warning(
+                    "Raw screencap header not recognised (attempt %s)", attempts
+                )
+                time.sleep(1)
+                continue
+            width, height, header_size = header
+            return np.frombuffer(
+                self._shot_buf,
+                dtype=np.uint8,
+                count=width * height * 4,
+                offset=header_size,
+            ).reshape(height, width, 4)
+        logging.error("Unable to capture valid screenshot after retries")
+        return None
+
+    def enable_sendevent(self) -> None:
+        """Probe the touchscreen so taps can bypass ``input tap``.
+
+        ``input tap`` starts an app_process (a Java VM) on the device for
+        every tap; writing evdev events with ``sendevent`` executes in
+        microseconds.  This inspects ``getevent -lp`` for the multitouch
+        device and its coordinate ranges plus ``wm size`` for pixel
+        scaling.  On any probe failure the client simply stays on the
+        ``input tap`` path.
+        """
+
+        try:
+            listing = self.run("shell", "getevent", "-lp").stdout
+            size_out = self.run("shell", "wm", "size").stdout
+        except (AdbError, OSError, subprocess.SubprocessError):
+            logging.warning(
+                "Touchscreen probe failed – keeping 'input tap' path"
+            )
+            return
+        device = None
+        current = None
+        max_x = max_y = 0
+        for line in listing.splitlines():
+            match = re.match(r"add device \d+:\s+(\S+)", line)
+            if match:
+                current = match.group(1)
+                continue
+            bounds = re.search(r"max\s+(\d+)", line)
+            if bounds is None or current is None:
+                continue
+            if "ABS_MT_POSITION_X" in line:
+                device, max_x = current, int(bounds.group(1))
+            elif "ABS_MT_POSITION_Y" in line and current == device:
+                max_y = int(bounds.group(1))
+        size_match = re.search(r"(\d+)x(\d+)", size_out)
+        if not device or not max_x or not max_y or size_match is None:
+            logging.warning(
+                "No multitouch device found – keeping 'input tap' path"
+            )
+            return
+        width, height = int(size_match.group(1)), int(size_match.group(2))
+        self._touch = (device, max_x, max_y, width, height)
+        logging.info(
+            "sendevent taps enabled via %s (range %sx%s, screen %sx%s)",
+            device,
+            max_x,
+            max_y,
+            width,
+            height,
+        )
+
+    def _sendevent_tap(self, x: int, y: int) -> None:
+        device, max_x, max_y, width, height = self._touch
+        dev_x = x * max_x // max(1, width - 1)
+        dev_y = y * max_y // max(1, height - 1)
+        # Down (tracking id + BTN_TOUCH + position + SYN) followed by up;
+        # coalesced into one shell line so the persistent shell runs the
+        # whole gesture in a single round-trip.
+        self.shell_exec(
+            "; ".join(
+                (
+                    f"sendevent {device} 3 57 0",
+                    f"sendevent {device} 1 330 1",
+                    f"sendevent {device} 3 53 {dev_x}",
+                    f"sendevent {device} 3 54 {dev_y}",
+                    f"sendevent {device} 0 0 0",
+                    f"sendevent {device} 3 57 4294967295",
+                    f"sendevent {device} 1 330 0",
+                    f"sendevent {device} 0 0 0",
+                )
+            )
+        )
+
     def perform_tap(self, x: int, y: int) -> None:
         logging.info("ADB tap at (%s, %s)", x, y)
-        self.run("shell", "input", "tap", str(x), str(y))
+        if self._touch is not None:
+            try:
+                self._sendevent_tap(x, y)
+                return
+            except Exception:
+                logging.exception(
+                    "sendevent tap failed – falling back to 'input tap'"
+                )
+                self._touch = None
+        self.shell_exec(f"input tap {x} {y}")
 
     def perform_swipe(
         self, x1: int, y1: int, x2: int, y2: int, duration_ms: int = 300
     ) -> None:
         logging.info("ADB swipe (%s,%s) -> (%s,%s)", x1, y1, x2, y2)
-        self.run(
-            "shell",
-            "input",
-            "swipe",
-            str(x1),
-            str(y1),
-            str(x2),
-            str(y2),
-            str(duration_ms),
-        )
+        self.shell_exec(f"input swipe {x1} {y1} {x2} {y2} {duration_ms}")
 
     def perform_sleep(self, seconds: float) -> None:
         logging.info("Sleep for %.2fs", seconds)
         time.sleep(seconds)
 
     def execute_steps(
-        self, steps: Sequence[Dict[str, Any]], default_delay: float = 4.0
+        self,
+        steps: Sequence[Union[UiStep, Dict[str, Any]]],
+        default_delay: float = 4.0,
     ) -> None:
         for idx, step in enumerate(steps):
+            if isinstance(step, (TapStep, SwipeStep, SleepStep, ShellStep)):
+                self._execute_compiled_step(step, default_delay)
+                continue
             action = step.get("action") or step.get("type")
             if not action:
                 logging.warning("Skipping malformed UI step: %s", step)
                 continue
             action = action.lower()
+            # The per-step delay is treated as a deadline measured from the
+            # start of the step, so time spent inside the ADB command
+            # itself counts toward the dwell instead of drifting on top of
+            # it.
+            started = time.monotonic()
             if action == "tap":
                 x, y = int(step["x"]), int(step["y"])
                 self.perform_tap(x, y)
-                time.sleep(step.get("delay", default_delay))
+                self._sleep_until(started + step.get("delay", default_delay))
             elif action == "swipe":
                 self.perform_swipe(
                     int(step["x1"]),
@@ -199,24 +820,44 @@ class ADBClient:
                     int(step["y2"]),
                     int(step.get("duration_ms", 300)),
                 )
-                time.sleep(step.get("delay", default_delay))
+                self._sleep_until(started + step.get("delay", default_delay))
             elif action == "sleep":
                 self.perform_sleep(
                     float(step.get("seconds", step.get("duration", 0)))
                 )
             elif action == "shell":
                 command = step.get("command")
-                if isinstance(command, str):
-                    args = command.split()
-                else:
-                    args = list(command or [])
-                self.run("shell", *args)
-                time.sleep(step.get("delay", default_delay))
+                if not isinstance(command, str):
+                    command = " ".join(command or [])
+                self.shell_exec(command)
+                self._sleep_until(started + step.get("delay", default_delay))
             else:
                 logging.warning(
                     "Unknown UI step action '%s' (step %s)", action, idx
                 )
 
+    def _execute_compiled_step(self, step: UiStep, default_delay: float) -> None:
+        started = time.monotonic()
+        if isinstance(step, TapStep):
+            self.perform_tap(step.x, step.y)
+        elif isinstance(step, SwipeStep):
+            self.perform_swipe(
+                step.x1, step.y1, step.x2, step.y2, step.duration_ms
+            )
+        elif isinstance(step, SleepStep):
+            self.perform_sleep(step.seconds)
+            return
+        else:
+            self.shell_exec(step.command)
+        delay = step.delay if step.delay is not None else default_delay
+        self._sleep_until(started + delay)
+
+    @staticmethod
+    def _sleep_until(deadline: float) -> None:
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
     def read_android_clipboard(self) -> Optional[str]:
         try:
             result = self.run("shell", "cmd", "clipboard", "get")
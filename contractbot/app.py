@@ -2,17 +2,23 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import logging
 import threading
 from pathlib import Path
 from typing import Optional, Sequence
 
+try:  # pragma: no cover - optional dependency guards
+    import uvloop
+except ImportError:  # pragma: no cover - runtime guard
+    uvloop = None  # type: ignore[assignment]
+
 from .adb import ADBClient
 from .buyback import BuybackManager
 from .config import Config
 from .database import Database
 from .notifications import ContractNotification
-from .ocr import OcrEngine
+from .ocr import shared_engine
 from .parsing import CompositionParser
 from .processor import ContractProcessor
 
@@ -28,7 +34,9 @@ class ContractBotApplication:
         logging.info("ContractBot service starting")
         adb_serial = self._ensure_adb_serial()
         adb_client = ADBClient(adb_serial)
-        ocr_engine = OcrEngine(self.config.ocr_lang, self.config.tesseract_cmd)
+        if self.config.use_sendevent:
+            adb_client.enable_sendevent()
+        ocr_engine = shared_engine(self.config.ocr_lang, self.config.tesseract_cmd)
 
         from . import discord_bot
 
@@ -38,12 +46,41 @@ class ContractBotApplication:
         )
 
         if has_discord:
+            if uvloop is not None:
+                # libuv-backed loop: fewer syscalls per wakeup, which
+                # shaves interaction defer latency under load.
+                uvloop.install()
+                logging.info("Using uvloop event loop policy")
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             notification_queue: "asyncio.Queue[ContractNotification]" = asyncio.Queue()
 
+            # Notifications are staged in a thread-safe deque and flushed
+            # into the asyncio queue by a single scheduled drain, so a
+            # burst of contracts costs one selector wakeup instead of one
+            # per event.
+            pending: "collections.deque[ContractNotification]" = collections.deque()
+            wake_lock = threading.Lock()
+            wake_scheduled = False
+
+            def drain_notifications() -> None:
+                nonlocal wake_scheduled
+                with wake_lock:
+                    wake_scheduled = False
+                while True:
+                    try:
+                        notification_queue.put_nowait(pending.popleft())
+                    except IndexError:
+                        break
+
             def notify(notification: ContractNotification) -> None:
-                loop.call_soon_threadsafe(notification_queue.put_nowait, notification)
+                nonlocal wake_scheduled
+                pending.append(notification)
+                with wake_lock:
+                    if wake_scheduled:
+                        return
+                    wake_scheduled = True
+                loop.call_soon_threadsafe(drain_notifications)
 
             processor = ContractProcessor(
                 adb_client,
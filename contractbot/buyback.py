@@ -2,20 +2,23 @@
 from __future__ import annotations
 
 import logging
-import threading
 
 
 class BuybackManager:
+    """Holds the buyback percent shared between processor and bot threads.
+
+    A single float attribute load/store is atomic under the CPython GIL,
+    so no lock is needed: readers on the contract-processing hot path see
+    either the old or the new value, never a torn one.
+    """
+
     def __init__(self, initial_percent: float):
         self._percent = float(initial_percent)
-        self._lock = threading.Lock()
 
     @property
     def percent(self) -> float:
-        with self._lock:
-            return self._percent
+        return self._percent
 
     def set_percent(self, value: float) -> None:
-        with self._lock:
-            self._percent = float(value)
+        self._percent = float(value)
         logging.info("Buyback percent updated to %.2f%%", value)
@@ -4,12 +4,33 @@ from __future__ import annotations
 import dataclasses
 import json
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Dict, Optional, Sequence, Tuple
 
+from .adb import UiStep, compile_steps
 from .utils import optional_int
 
+try:  # pragma: no cover - optional dependency guards
+    import orjson
+except ImportError:  # pragma: no cover - runtime guard
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialise *data* to JSON bytes, preferring :mod:`orjson` if present."""
+
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 @dataclass
 class DiscordConfig:
@@ -34,18 +55,43 @@ class Config:
     poll_interval_sec: float = 30.0
     cooldown_after_contract_sec: float = 5.0
     buyback_percent: float = 100.0
+    #: Route taps through raw sendevent writes instead of ``input tap``
+    #: (requires a readable touch device node; see
+    #: :meth:`ADBClient.enable_sendevent`).
+    use_sendevent: bool = False
+    #: OCR artifact retention: ``"all"`` saves the screenshot and crops
+    #: for every contract, ``"errors_only"`` only when the clipboard
+    #: parse failed and the OCR fallback ran, ``"none"`` never writes
+    #: artifacts.
+    artifacts_mode: str = "all"
     ui: Dict[str, Sequence[Dict[str, Any]]] = dataclasses.field(default_factory=dict)
-    ocr_boxes: Dict[str, Sequence[int]] = dataclasses.field(default_factory=dict)
+    #: Entries are either ``[left, top, right, bottom]`` or a mapping
+    #: ``{"box": [...], "psm": 7, "whitelist": "0123456789:."}`` with
+    #: per-box recognition hints (see :func:`contractbot.ocr.box_spec`).
+    ocr_boxes: Dict[str, Any] = dataclasses.field(default_factory=dict)
     discord: DiscordConfig = dataclasses.field(default_factory=DiscordConfig)
     config_path: Path = Path("config.json")
+    #: UI macros precompiled into typed steps; populated lazily from
+    #: :attr:`ui`, which keeps the raw JSON form for persistence.
+    compiled_ui: Dict[str, Tuple[UiStep, ...]] = dataclasses.field(
+        default_factory=dict, repr=False
+    )
+
+    def ui_steps(self, name: str) -> Tuple[UiStep, ...]:
+        """Return the precompiled UI step program *name* (empty if absent)."""
+
+        steps = self.compiled_ui.get(name)
+        if steps is None:
+            steps = compile_steps(self.ui.get(name, ()))
+            self.compiled_ui[name] = steps
+        return steps
 
     @staticmethod
     def load(path: Path) -> "Config":
         """Load configuration from ``path``."""
 
         logging.debug("Loading configuration from %s", path)
-        with path.open("r", encoding="utf-8") as fh:
-            raw = json.load(fh)
+        raw = _loads(path.read_bytes())
 
         discord_raw = raw.get("discord", {})
         config = Config(
@@ -58,6 +104,8 @@ class Config:
                 raw.get("cooldown_after_contract_sec", 5.0)
             ),
             buyback_percent=float(raw.get("buyback_percent", 100.0)),
+            use_sendevent=bool(raw.get("use_sendevent", False)),
+            artifacts_mode=str(raw.get("artifacts_mode", "all")),
             ui=raw.get("ui", {}),
             ocr_boxes=raw.get("ocr_boxes", {}),
             discord=DiscordConfig(
@@ -74,6 +122,9 @@ class Config:
             ),
             config_path=path,
         )
+        config.compiled_ui = {
+            name: compile_steps(steps) for name, steps in config.ui.items()
+        }
         return config
 
     def persist(self) -> None:
@@ -88,6 +139,8 @@ class Config:
             "poll_interval_sec": self.poll_interval_sec,
             "cooldown_after_contract_sec": self.cooldown_after_contract_sec,
             "buyback_percent": self.buyback_percent,
+            "use_sendevent": self.use_sendevent,
+            "artifacts_mode": self.artifacts_mode,
             "ui": self.ui,
             "ocr_boxes": self.ocr_boxes,
             "discord": {
@@ -99,5 +152,8 @@ class Config:
                 "public_command_replies": self.discord.public_command_replies,
             },
         }
-        with self.config_path.open("w", encoding="utf-8") as fh:
-            json.dump(base, fh, indent=2, ensure_ascii=False)
+        # Write to a sibling temp file and rename over the target so a
+        # crash mid-write can never leave a truncated config.json behind.
+        tmp_path = self.config_path.with_suffix(self.config_path.suffix + ".tmp")
+        tmp_path.write_bytes(_dumps(base))
+        os.replace(tmp_path, self.config_path)
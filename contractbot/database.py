@@ -2,139 +2,272 @@
 from __future__ import annotations
 
 import logging
+import math
 import sqlite3
 import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Sequence, Tuple
+from typing import Any, List, Optional, Sequence, Tuple
 
 from .parsing import ContractItem
 
+# Hot-path SQL hoisted to module constants so every call passes the same
+# string object and the sqlite3 per-connection statement cache always
+# hits instead of re-preparing.
+#: Upper bound for the in-process lookup caches below.
+_LOOKUP_CACHE_CAP = 512
+
+#: RETURNING requires SQLite >= 3.35; operator machines may bundle older
+#: builds, so single-round-trip paths keep a legacy fallback.
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+#: Full schema as one auditable script; :meth:`Database.ensure_schema`
+#: applies it in a single executescript pass, with the legacy-column
+#: migration kept separate below.
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        discord_id INTEGER UNIQUE,
+        display_name TEXT
+    );
+    CREATE TABLE IF NOT EXISTS characters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+        game_nick TEXT UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS contracts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        system TEXT,
+        player_name TEXT,
+        user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+        buyback_percent REAL,
+        est_total REAL,
+        bisk_credited REAL
+    );
+    CREATE TABLE IF NOT EXISTS contract_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
+        item_name TEXT,
+        qty REAL,
+        est_value REAL,
+        UNIQUE(contract_id, item_name)
+    );
+    CREATE TABLE IF NOT EXISTS inventory (
+        system TEXT,
+        item_name TEXT,
+        qty REAL,
+        PRIMARY KEY(system, item_name)
+    );
+    CREATE TABLE IF NOT EXISTS payouts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+        amount REAL,
+        reason TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS settings (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS ocr_samples (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
+        box_name TEXT,
+        box_left INTEGER,
+        box_top INTEGER,
+        box_right INTEGER,
+        box_bottom INTEGER,
+        recognized_text TEXT,
+        confirmed_text TEXT,
+        status TEXT DEFAULT 'pending',
+        image_path TEXT,
+        reviewed_by INTEGER,
+        reviewed_by_name TEXT,
+        reviewed_at TIMESTAMP,
+        needs_training INTEGER DEFAULT 0,
+        UNIQUE(contract_id, box_name)
+    );
+    CREATE TABLE IF NOT EXISTS ocr_training_words (
+        word TEXT PRIMARY KEY,
+        trained INTEGER DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS user_balances (
+        user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+        balance REAL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_contracts_user ON contracts(user_id);
+    CREATE INDEX IF NOT EXISTS idx_payouts_user ON payouts(user_id);
+    -- Partial indexes matching the exact predicates of the two remaining
+    -- scans: link_character's backfill UPDATE over unlinked contracts and
+    -- consume_training_words' pending-word lookup.
+    -- ocr_samples(contract_id, box_name) is already covered by its UNIQUE
+    -- constraint.
+    CREATE INDEX IF NOT EXISTS idx_contracts_player
+        ON contracts(player_name) WHERE user_id IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_training_pending
+        ON ocr_training_words(trained) WHERE trained = 0;
+"""
+
+_SQL_GET_SETTING = "SELECT value FROM settings WHERE key = ?"
+_SQL_GET_USER_BY_NICK = "SELECT user_id FROM characters WHERE game_nick = ?"
+#: One-shot migration for databases predating ``user_balances``: without
+#: it, a legacy user's first new contract would upsert a row holding only
+#: the delta and the lazy seeding paths would never run again, silently
+#: dropping the historical balance.
+_SQL_BACKFILL_BALANCES = """
+    INSERT INTO user_balances(user_id, balance)
+    SELECT u.id,
+           (SELECT COALESCE(SUM(bisk_credited), 0) FROM contracts WHERE user_id = u.id)
+         - (SELECT COALESCE(SUM(amount), 0) FROM payouts WHERE user_id = u.id)
+    FROM users u
+    WHERE NOT EXISTS (
+        SELECT 1 FROM user_balances b WHERE b.user_id = u.id
+    )
+"""
+_SQL_SEED_BALANCE = """
+    INSERT INTO user_balances(user_id, balance)
+    VALUES (
+        ?,
+        (SELECT COALESCE(SUM(bisk_credited), 0) FROM contracts WHERE user_id = ?)
+      - (SELECT COALESCE(SUM(amount), 0) FROM payouts WHERE user_id = ?)
+    )
+    ON CONFLICT(user_id) DO UPDATE SET balance = excluded.balance
+"""
+_SQL_ADD_BALANCE = """
+    INSERT INTO user_balances(user_id, balance) VALUES(?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET balance = balance + excluded.balance
+"""
+_SQL_INSERT_CONTRACT = """
+    INSERT INTO contracts(system, player_name, user_id, buyback_percent, est_total, bisk_credited)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_SQL_UPSERT_CONTRACT_ITEM = """
+    INSERT INTO contract_items(contract_id, item_name, qty, est_value)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(contract_id, item_name) DO UPDATE SET
+        qty = excluded.qty,
+        est_value = excluded.est_value
+"""
+_SQL_UPSERT_INVENTORY = """
+    INSERT INTO inventory(system, item_name, qty)
+    VALUES (?, ?, ?)
+    ON CONFLICT(system, item_name) DO UPDATE SET
+        qty = qty + excluded.qty
+"""
+_SQL_UPSERT_OCR_SAMPLE = """
+    INSERT INTO ocr_samples(
+        contract_id,
+        box_name,
+        box_left,
+        box_top,
+        box_right,
+        box_bottom,
+        recognized_text,
+        image_path
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(contract_id, box_name) DO UPDATE SET
+        box_left = excluded.box_left,
+        box_top = excluded.box_top,
+        box_right = excluded.box_right,
+        box_bottom = excluded.box_bottom,
+        recognized_text = excluded.recognized_text,
+        image_path = excluded.image_path
+"""
+
 
 class Database:
     """Encapsulate the SQLite schema and business operations."""
 
     def __init__(self, path: Path):
         self.path = path
+        # Serialises every transaction on the shared writer connection
+        # (the processor thread and the Discord asyncio.to_thread workers
+        # all write through it) and guards the read-connection registry.
+        # Without it, "with self._connection:" blocks from different
+        # threads interleave on one connection and a commit from one can
+        # flush another's half-finished transaction.
         self._connection_lock = threading.Lock()
-        self._connection = sqlite3.connect(self.path)
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, cached_statements=256
+        )
         self._connection.row_factory = sqlite3.Row
+        # Small LRU caches for lookups keyed by short immutable strings
+        # that change rarely; writers (link_character, set_setting)
+        # refresh the affected keys so entries never go stale.
+        self._nick_cache: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self._settings_cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        # WAL permits concurrent readers alongside the single writer, so
+        # SELECT-only helpers get a per-thread read connection instead of
+        # serialising on the shared writer connection.
+        self._tls = threading.local()
+        self._read_connections: List[sqlite3.Connection] = []
+        self._tune_connection()
         self.ensure_schema()
 
+    def _tune_connection(self) -> None:
+        """Apply performance pragmas to the shared connection.
+
+        The defaults (rollback journal, synchronous=FULL) fsync twice per
+        commit, which dominates the contract ingest path.  WAL with
+        synchronous=NORMAL keeps durability for application crashes while
+        cutting commit latency, and lets readers proceed alongside the
+        writer.
+        """
+
+        self._connection.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-65536;
+            PRAGMA mmap_size=268435456;
+            """
+        )
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, creating it lazily.
+
+        Writes stay on the shared writer connection; under WAL the extra
+        reader connections never block it, so SELECT-only helpers called
+        from the Discord and processor threads stop contending for the
+        writer's lock.
+        """
+
+        conn = getattr(self._tls, "read_connection", None)
+        if conn is None:
+            # Read connections keep the default tuple rows: positional
+            # indexing is a C array access, while sqlite3.Row's keyed
+            # lookup scans column names on every access.
+            conn = sqlite3.connect(
+                self.path, check_same_thread=False, cached_statements=256
+            )
+            conn.execute("PRAGMA query_only=1")
+            self._tls.read_connection = conn
+            with self._connection_lock:
+                self._read_connections.append(conn)
+        return conn
+
     def ensure_schema(self) -> None:
         logging.info("Ensuring database schema")
-        with self._connection as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    discord_id INTEGER UNIQUE,
-                    display_name TEXT
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS characters (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
-                    game_nick TEXT UNIQUE
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS contracts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    system TEXT,
-                    player_name TEXT,
-                    user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
-                    buyback_percent REAL,
-                    est_total REAL,
-                    bisk_credited REAL
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS contract_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
-                    item_name TEXT,
-                    qty REAL,
-                    est_value REAL,
-                    UNIQUE(contract_id, item_name)
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS inventory (
-                    system TEXT,
-                    item_name TEXT,
-                    qty REAL,
-                    PRIMARY KEY(system, item_name)
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS payouts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-                    amount REAL,
-                    reason TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
+        self._connection.executescript(_SCHEMA_SQL)
+        with self._connection_lock, self._connection as conn:
+            existing_columns = {
+                row["name"]
+                for row in conn.execute("PRAGMA table_info(contracts)")
+            }
             for column in ("buyback_percent", "est_total", "bisk_credited"):
-                try:
-                    conn.execute(f"SELECT {column} FROM contracts LIMIT 1")
-                except sqlite3.OperationalError:
+                if column not in existing_columns:
                     conn.execute(
                         f"ALTER TABLE contracts ADD COLUMN {column} REAL"
                     )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS ocr_samples (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    contract_id INTEGER REFERENCES contracts(id) ON DELETE CASCADE,
-                    box_name TEXT,
-                    box_left INTEGER,
-                    box_top INTEGER,
-                    box_right INTEGER,
-                    box_bottom INTEGER,
-                    recognized_text TEXT,
-                    confirmed_text TEXT,
-                    status TEXT DEFAULT 'pending',
-                    image_path TEXT,
-                    reviewed_by INTEGER,
-                    reviewed_by_name TEXT,
-                    reviewed_at TIMESTAMP,
-                    needs_training INTEGER DEFAULT 0,
-                    UNIQUE(contract_id, box_name)
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS ocr_training_words (
-                    word TEXT PRIMARY KEY,
-                    trained INTEGER DEFAULT 0
-                )
-                """
-            )
+            conn.execute(_SQL_BACKFILL_BALANCES)
 
     def close(self) -> None:
+        with self._connection_lock:
+            for conn in self._read_connections:
+                conn.close()
+            self._read_connections.clear()
         self._connection.close()
 
     # ------------------------------------------------------------------
@@ -142,17 +275,17 @@ class Database:
     # ------------------------------------------------------------------
 
     def get_setting(self, key: str) -> Optional[str]:
-        cur = self._connection.execute(
-            "SELECT value FROM settings WHERE key = ?",
-            (key,),
-        )
+        if key in self._settings_cache:
+            self._settings_cache.move_to_end(key)
+            return self._settings_cache[key]
+        cur = self._read_connection().execute(_SQL_GET_SETTING, (key,))
         row = cur.fetchone()
-        if row:
-            return row["value"]
-        return None
+        value = row[0] if row else None
+        self._cache_store(self._settings_cache, key, value)
+        return value
 
     def set_setting(self, key: str, value: Optional[str]) -> None:
-        with self._connection as conn:
+        with self._connection_lock, self._connection as conn:
             if value is None:
                 conn.execute("DELETE FROM settings WHERE key = ?", (key,))
             else:
@@ -163,13 +296,32 @@ class Database:
                     """,
                     (key, value),
                 )
+        self._cache_store(self._settings_cache, key, value)
+
+    @staticmethod
+    def _cache_store(cache: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > _LOOKUP_CACHE_CAP:
+            cache.popitem(last=False)
 
     # ------------------------------------------------------------------
     # User / character utilities
     # ------------------------------------------------------------------
 
     def get_or_create_user(self, discord_id: int, display_name: str) -> int:
-        with self._connection as conn:
+        with self._connection_lock, self._connection as conn:
+            if _SUPPORTS_RETURNING:
+                cur = conn.execute(
+                    """
+                    INSERT INTO users(discord_id, display_name) VALUES (?, ?)
+                    ON CONFLICT(discord_id) DO UPDATE SET
+                        display_name = excluded.display_name
+                    RETURNING id
+                    """,
+                    (discord_id, display_name),
+                )
+                return int(cur.fetchone()["id"])
             cur = conn.execute(
                 "SELECT id FROM users WHERE discord_id = ?",
                 (discord_id,),
@@ -184,7 +336,7 @@ class Database:
             return int(cur.lastrowid)
 
     def link_character(self, user_id: int, game_nick: str) -> None:
-        with self._connection as conn:
+        with self._connection_lock, self._connection as conn:
             cur = conn.execute(
                 "SELECT id FROM characters WHERE game_nick = ?",
                 (game_nick,),
@@ -204,29 +356,45 @@ class Database:
                 "UPDATE contracts SET user_id = ? WHERE player_name = ? AND user_id IS NULL",
                 (user_id, game_nick),
             )
+            # The backfill may have attached historic contracts, so
+            # recompute this user's running balance from the aggregates.
+            conn.execute(_SQL_SEED_BALANCE, (user_id, user_id, user_id))
+        self._cache_store(self._nick_cache, game_nick, user_id)
 
     def get_user_by_character(self, game_nick: str) -> Optional[int]:
-        cur = self._connection.execute(
-            "SELECT user_id FROM characters WHERE game_nick = ?",
-            (game_nick,),
-        )
+        if game_nick in self._nick_cache:
+            self._nick_cache.move_to_end(game_nick)
+            return self._nick_cache[game_nick]
+        cur = self._read_connection().execute(_SQL_GET_USER_BY_NICK, (game_nick,))
         row = cur.fetchone()
-        if row and row["user_id"] is not None:
-            return int(row["user_id"])
-        return None
+        user_id = int(row[0]) if row and row[0] is not None else None
+        self._cache_store(self._nick_cache, game_nick, user_id)
+        return user_id
 
     def calculate_balance(self, user_id: int) -> float:
-        cur = self._connection.execute(
-            "SELECT COALESCE(SUM(bisk_credited), 0) AS total FROM contracts WHERE user_id = ?",
-            (user_id,),
-        )
-        contracts_total = float(cur.fetchone()["total"])
-        cur = self._connection.execute(
-            "SELECT COALESCE(SUM(amount), 0) AS total FROM payouts WHERE user_id = ?",
+        """Return the user's BISK balance from the running-total table.
+
+        ``user_balances`` is maintained incrementally by
+        :meth:`record_contract` and :meth:`link_character`, turning the
+        per-command balance lookup into a primary-key fetch instead of two
+        aggregate scans.  A missing row is seeded from the aggregates, so
+        databases predating the table stay correct.
+        """
+
+        cur = self._read_connection().execute(
+            "SELECT balance FROM user_balances WHERE user_id = ?",
             (user_id,),
         )
-        payouts_total = float(cur.fetchone()["total"])
-        return contracts_total - payouts_total
+        row = cur.fetchone()
+        if row is not None:
+            return float(row[0])
+        with self._connection_lock, self._connection as conn:
+            conn.execute(_SQL_SEED_BALANCE, (user_id, user_id, user_id))
+            cur = conn.execute(
+                "SELECT balance FROM user_balances WHERE user_id = ?",
+                (user_id,),
+            )
+            return float(cur.fetchone()["balance"])
 
     # ------------------------------------------------------------------
     # Contract persistence
@@ -239,8 +407,18 @@ class Database:
         buyback_percent: float,
         items: Sequence[ContractItem],
         user_id: Optional[int],
-    ) -> Tuple[int, float, float]:
-        est_total = sum(item.est_value for item in items)
+    ) -> Tuple[int, float, float, Optional[int]]:
+        """Persist a contract and return
+        ``(contract_id, est_total, bisk_credited, discord_id)``.
+
+        The Discord id rides along from inside the same transaction so
+        the notification path needs no follow-up SELECT per contract.
+        """
+
+        # fsum iterates in C and tracks exact partial sums, so large item
+        # lists neither accumulate float error in bisk_credited nor churn
+        # intermediate float objects.
+        est_total = math.fsum(item.est_value for item in items)
         bisk_credited = est_total * (buyback_percent / 100.0)
         logging.info(
             "Recording contract for player '%s' (system: %s) – est_total=%.2f, bisk=%.2f",
@@ -249,92 +427,92 @@ class Database:
             est_total,
             bisk_credited,
         )
-        with self._connection as conn:
+        with self._connection_lock, self._connection as conn:
             cur = conn.execute(
-                """
-                INSERT INTO contracts(system, player_name, user_id, buyback_percent, est_total, bisk_credited)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_INSERT_CONTRACT,
                 (system, player_name, user_id, buyback_percent, est_total, bisk_credited),
             )
             contract_id = int(cur.lastrowid)
-            for item in items:
-                conn.execute(
-                    """
-                    INSERT INTO contract_items(contract_id, item_name, qty, est_value)
-                    VALUES (?, ?, ?, ?)
-                    ON CONFLICT(contract_id, item_name) DO UPDATE SET
-                        qty = excluded.qty,
-                        est_value = excluded.est_value
-                    """,
-                    (contract_id, item.item_name, item.quantity, item.est_value),
-                )
-                conn.execute(
-                    """
-                    INSERT INTO inventory(system, item_name, qty)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(system, item_name) DO UPDATE SET
-                        qty = qty + excluded.qty
-                    """,
-                    (system, item.item_name, item.quantity),
-                )
-        return contract_id, est_total, bisk_credited
+            conn.executemany(
+                _SQL_UPSERT_CONTRACT_ITEM,
+                [
+                    (contract_id, item.item_name, item.quantity, item.est_value)
+                    for item in items
+                ],
+            )
+            conn.executemany(
+                _SQL_UPSERT_INVENTORY,
+                [(system, item.item_name, item.quantity) for item in items],
+            )
+            discord_id: Optional[int] = None
+            if user_id is not None:
+                conn.execute(_SQL_ADD_BALANCE, (user_id, bisk_credited))
+                row = conn.execute(
+                    "SELECT discord_id FROM users WHERE id = ?",
+                    (user_id,),
+                ).fetchone()
+                if row and row["discord_id"] is not None:
+                    discord_id = int(row["discord_id"])
+        return contract_id, est_total, bisk_credited, discord_id
 
     # ------------------------------------------------------------------
     # OCR feedback and training utilities
     # ------------------------------------------------------------------
 
-    def store_ocr_sample(
+    def store_ocr_samples(
         self,
         contract_id: int,
-        box_name: str,
-        box: Sequence[int],
-        recognized_text: str,
-        image_path: Optional[str],
+        samples: Sequence[Tuple[str, Sequence[int], str, Optional[str]]],
     ) -> None:
-        if len(box) < 4:
-            logging.warning(
-                "Skipping OCR sample persistence for '%s' – invalid box %s",
-                box_name,
-                box,
-            )
-            return
-        box_values = tuple(int(value) for value in box[:4])
-        with self._connection as conn:
-            conn.execute(
-                """
-                INSERT INTO ocr_samples(
-                    contract_id,
+        """Persist OCR samples for *contract_id* in a single transaction.
+
+        ``samples`` holds ``(box_name, box, recognized_text, image_path)``
+        tuples.  The per-contract pipeline stores several boxes at once;
+        batching them through one executemany costs one commit instead of
+        one per box.
+        """
+
+        rows = []
+        for box_name, box, recognized_text, image_path in samples:
+            if len(box) < 4:
+                logging.warning(
+                    "Skipping OCR sample persistence for '%s' – invalid box %s",
                     box_name,
-                    box_left,
-                    box_top,
-                    box_right,
-                    box_bottom,
-                    recognized_text,
-                    image_path
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(contract_id, box_name) DO UPDATE SET
-                    box_left = excluded.box_left,
-                    box_top = excluded.box_top,
-                    box_right = excluded.box_right,
-                    box_bottom = excluded.box_bottom,
-                    recognized_text = excluded.recognized_text,
-                    image_path = excluded.image_path
-                """,
+                    box,
+                )
+                continue
+            left, top, right, bottom = map(int, box[:4])
+            rows.append(
                 (
                     contract_id,
                     box_name,
-                    box_values[0],
-                    box_values[1],
-                    box_values[2],
-                    box_values[3],
+                    left,
+                    top,
+                    right,
+                    bottom,
                     recognized_text,
                     image_path,
-                ),
+                )
             )
+        if not rows:
+            return
+        with self._connection_lock, self._connection as conn:
+            conn.executemany(_SQL_UPSERT_OCR_SAMPLE, rows)
+
+    def store_ocr_sample(
+        self,
+        contract_id: int,
+        box_name: str,
+        box: Sequence[int],
+        recognized_text: str,
+        image_path: Optional[str],
+    ) -> None:
+        self.store_ocr_samples(
+            contract_id, ((box_name, box, recognized_text, image_path),)
+        )
 
     def get_ocr_sample(self, contract_id: int, box_name: str) -> Optional[dict]:
-        cur = self._connection.execute(
+        cur = self._read_connection().execute(
             """
             SELECT box_name, recognized_text, confirmed_text, status
             FROM ocr_samples
@@ -346,16 +524,16 @@ class Database:
         if row is None:
             return None
         return {
-            "box_name": row["box_name"],
-            "recognized_text": row["recognized_text"] or "",
-            "confirmed_text": row["confirmed_text"] or "",
-            "status": row["status"],
+            "box_name": row[0],
+            "recognized_text": row[1] or "",
+            "confirmed_text": row[2] or "",
+            "status": row[3],
         }
 
     def confirm_ocr_contract(
         self, contract_id: int, reviewer_id: int, reviewer_name: str
     ) -> Sequence[Tuple[str, str]]:
-        with self._connection as conn:
+        with self._connection_lock, self._connection as conn:
             conn.execute(
                 """
                 UPDATE ocr_samples
@@ -372,16 +550,17 @@ class Database:
                 """,
                 (reviewer_id, reviewer_name, contract_id),
             )
-            cur = conn.execute(
-                """
-                SELECT box_name, COALESCE(confirmed_text, '') AS final_text
-                FROM ocr_samples
-                WHERE contract_id = ?
-                """,
-                (contract_id,),
-            )
-            rows = cur.fetchall()
-        return [(row["box_name"], row["final_text"]) for row in rows]
+        # The re-read happens after the commit on a read connection, so
+        # the write lock on ocr_samples is held only for the UPDATE.
+        cur = self._read_connection().execute(
+            """
+            SELECT box_name, COALESCE(confirmed_text, '') AS final_text
+            FROM ocr_samples
+            WHERE contract_id = ?
+            """,
+            (contract_id,),
+        )
+        return [(row[0], row[1]) for row in cur]
 
     def correct_ocr_sample(
         self,
@@ -391,17 +570,32 @@ class Database:
         reviewer_id: int,
         reviewer_name: str,
     ) -> Optional[str]:
-        cur = self._connection.execute(
-            """
-            SELECT id FROM ocr_samples WHERE contract_id = ? AND box_name = ?
-            """,
-            (contract_id, box_name),
+        params = (
+            corrected_text,
+            reviewer_id,
+            reviewer_name,
+            contract_id,
+            box_name,
         )
-        row = cur.fetchone()
-        if row is None:
-            return None
-        with self._connection as conn:
-            conn.execute(
+        with self._connection_lock, self._connection as conn:
+            if _SUPPORTS_RETURNING:
+                cur = conn.execute(
+                    """
+                    UPDATE ocr_samples
+                    SET confirmed_text = ?,
+                        status = 'corrected',
+                        reviewed_by = ?,
+                        reviewed_by_name = ?,
+                        reviewed_at = CURRENT_TIMESTAMP,
+                        needs_training = 1
+                    WHERE contract_id = ? AND box_name = ?
+                    RETURNING COALESCE(confirmed_text, '') AS final_text
+                    """,
+                    params,
+                )
+                row = cur.fetchone()
+                return row["final_text"] if row is not None else None
+            cur = conn.execute(
                 """
                 UPDATE ocr_samples
                 SET confirmed_text = ?,
@@ -412,14 +606,10 @@ class Database:
                     needs_training = 1
                 WHERE contract_id = ? AND box_name = ?
                 """,
-                (
-                    corrected_text,
-                    reviewer_id,
-                    reviewer_name,
-                    contract_id,
-                    box_name,
-                ),
+                params,
             )
+            if cur.rowcount == 0:
+                return None
             cur = conn.execute(
                 """
                 SELECT COALESCE(confirmed_text, '') AS final_text
@@ -429,36 +619,39 @@ class Database:
                 (contract_id, box_name),
             )
             row = cur.fetchone()
-        if row is None:
-            return None
-        return row["final_text"]
+        return row["final_text"] if row is not None else None
 
     def queue_training_words(self, words: Sequence[str]) -> None:
-        if not words:
+        rows = [(word.strip(),) for word in words if word and word.strip()]
+        if not rows:
             return
-        with self._connection as conn:
-            for word in words:
-                normalized = word.strip()
-                if not normalized:
-                    continue
-                conn.execute(
-                    """
-                    INSERT INTO ocr_training_words(word, trained)
-                    VALUES(?, 0)
-                    ON CONFLICT(word) DO UPDATE SET trained = 0
-                    """,
-                    (normalized,),
-                )
+        with self._connection_lock, self._connection as conn:
+            conn.executemany(
+                """
+                INSERT INTO ocr_training_words(word, trained)
+                VALUES(?, 0)
+                ON CONFLICT(word) DO UPDATE SET trained = 0
+                """,
+                rows,
+            )
 
     def consume_training_words(self) -> Sequence[str]:
-        with self._connection as conn:
+        with self._connection_lock, self._connection as conn:
+            if _SUPPORTS_RETURNING:
+                cur = conn.execute(
+                    """
+                    UPDATE ocr_training_words SET trained = 1
+                    WHERE trained = 0
+                    RETURNING word
+                    """
+                )
+                return [row["word"] for row in cur.fetchall()]
             cur = conn.execute(
                 "SELECT word FROM ocr_training_words WHERE trained = 0"
             )
             words = [row["word"] for row in cur.fetchall()]
             if words:
-                conn.executemany(
-                    "UPDATE ocr_training_words SET trained = 1 WHERE word = ?",
-                    [(word,) for word in words],
+                conn.execute(
+                    "UPDATE ocr_training_words SET trained = 1 WHERE trained = 0"
                 )
         return words
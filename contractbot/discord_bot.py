@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import asyncio
+import io
 import logging
-import re
 from pathlib import Path
 from typing import Iterable, List, Optional
 
@@ -21,6 +21,9 @@ from .config import DiscordConfig
 from .database import Database
 from .notifications import ContractNotification
 
+#: Punctuation trimmed off whitespace-split training-word tokens.
+_TRAINING_WORD_PUNCT = ".,:;!?()[]{}\"'"
+
 
 if commands is None:  # pragma: no cover - runtime guard
 
@@ -53,6 +56,19 @@ else:
             self.contracts_channel_id = discord_config.contracts_channel_id
             self.guild_id = discord_config.guild_id
             self.admin_channel_id = self._load_admin_channel_id()
+            #: Role id matching ``admin_role_name``; resolved lazily on
+            #: the first _is_admin call (the guild cache is empty before
+            #: the gateway connects) so later checks avoid scanning role
+            #: names per command.
+            self._admin_role_id: Optional[int] = None
+            # Discord rate-limits per channel; five concurrent uploads is
+            # enough to overlap I/O without tripping the limiter.
+            self._admin_send_sem = asyncio.Semaphore(5)
+            # Resolved channel objects, cached so the notification hot
+            # path is an attribute read instead of a channel-cache walk
+            # per event.  set_admin_channel replaces the admin entry.
+            self._contracts_channel: Optional[discord.TextChannel] = None
+            self._admin_channel: Optional[discord.TextChannel] = None
             self._register_commands()
 
         async def setup_hook(self) -> None:
@@ -70,6 +86,13 @@ else:
                 )
                 await self.tree.sync()
 
+            self._contracts_channel = await self._resolve_text_channel(
+                self.contracts_channel_id
+            )
+            self._admin_channel = await self._resolve_text_channel(
+                self.admin_channel_id
+            )
+
             self.loop.create_task(self._notification_worker())
 
         # ------------------------------------------------------------------
@@ -80,11 +103,14 @@ else:
             @self.tree.command(description="Register your in-game nickname")
             async def register(interaction: discord.Interaction, game_nick: str) -> None:
                 await self._ensure_response(interaction)
-                user_id = self.db.get_or_create_user(
+                # sqlite3 calls block; run them off the event loop so a
+                # write stall cannot freeze other commands and workers.
+                user_id = await asyncio.to_thread(
+                    self.db.get_or_create_user,
                     discord_id=interaction.user.id,
                     display_name=str(interaction.user),
                 )
-                self.db.link_character(user_id, game_nick)
+                await asyncio.to_thread(self.db.link_character, user_id, game_nick)
                 await interaction.followup.send(
                     f"Nickname **{game_nick}** linked to your account.",
                     ephemeral=not self.public_replies,
@@ -93,11 +119,14 @@ else:
             @self.tree.command(description="Show your BISK balance")
             async def balance(interaction: discord.Interaction) -> None:
                 await self._ensure_response(interaction)
-                user_id = self.db.get_or_create_user(
+                user_id = await asyncio.to_thread(
+                    self.db.get_or_create_user,
                     discord_id=interaction.user.id,
                     display_name=str(interaction.user),
                 )
-                balance_value = self.db.calculate_balance(user_id)
+                balance_value = await asyncio.to_thread(
+                    self.db.calculate_balance, user_id
+                )
                 await interaction.followup.send(
                     f"Your current balance: **{balance_value:.2f} BISK**.",
                     ephemeral=not self.public_replies,
@@ -134,7 +163,10 @@ else:
                     )
                     return
                 self.admin_channel_id = channel.id
-                self.db.set_setting("discord_admin_channel_id", str(channel.id))
+                self._admin_channel = channel
+                await asyncio.to_thread(
+                    self.db.set_setting, "discord_admin_channel_id", str(channel.id)
+                )
                 await interaction.followup.send(
                     f"Канал администратора установлен: {channel.mention}",
                     ephemeral=not self.public_replies,
@@ -152,7 +184,8 @@ else:
                         ephemeral=True,
                     )
                     return
-                samples = self.db.confirm_ocr_contract(
+                samples = await asyncio.to_thread(
+                    self.db.confirm_ocr_contract,
                     contract_id,
                     reviewer_id=interaction.user.id,
                     reviewer_name=str(interaction.user),
@@ -166,7 +199,7 @@ else:
                 words = self._extract_training_words(
                     final_text for _, final_text in samples
                 )
-                self.db.queue_training_words(words)
+                await asyncio.to_thread(self.db.queue_training_words, words)
                 await interaction.followup.send(
                     f"OCR данные для контракта #{contract_id} подтверждены.",
                     ephemeral=not self.public_replies,
@@ -191,14 +224,17 @@ else:
                         ephemeral=True,
                     )
                     return
-                sample = self.db.get_ocr_sample(contract_id, field)
+                sample = await asyncio.to_thread(
+                    self.db.get_ocr_sample, contract_id, field
+                )
                 if sample is None:
                     await interaction.followup.send(
                         "Не удалось найти указанную область OCR для этого контракта.",
                         ephemeral=True,
                     )
                     return
-                final_text = self.db.correct_ocr_sample(
+                final_text = await asyncio.to_thread(
+                    self.db.correct_ocr_sample,
                     contract_id,
                     field,
                     corrected_text,
@@ -212,7 +248,7 @@ else:
                     )
                     return
                 words = self._extract_training_words([final_text])
-                self.db.queue_training_words(words)
+                await asyncio.to_thread(self.db.queue_training_words, words)
                 await interaction.followup.send(
                     (
                         "Исправление сохранено."
@@ -232,6 +268,23 @@ else:
             if self.discord_config.admin_role_name and isinstance(
                 interaction.user, discord.Member
             ):
+                if self._admin_role_id is None:
+                    # Resolved here rather than in setup_hook: the guild
+                    # cache is only populated after the gateway connects,
+                    # so the invoking member's guild is the first place
+                    # the role list is reliably available.
+                    self._admin_role_id = next(
+                        (
+                            role.id
+                            for role in interaction.user.guild.roles
+                            if role.name == self.discord_config.admin_role_name
+                        ),
+                        None,
+                    )
+                if self._admin_role_id is not None:
+                    return interaction.user.get_role(self._admin_role_id) is not None
+                # Role missing from the guild – fall back to scanning the
+                # member's role names.
                 for role in interaction.user.roles:
                     if role.name == self.discord_config.admin_role_name:
                         return True
@@ -239,93 +292,144 @@ else:
 
         async def _notification_worker(self) -> None:
             while True:
-                notification = await self.notification_queue.get()
+                # Drain bursts into one batch so N queued contracts cost
+                # a handful of REST calls instead of N round-trips.
+                batch = [await self.notification_queue.get()]
+                while len(batch) < 25:
+                    try:
+                        batch.append(self.notification_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
                 try:
-                    await self._handle_notification(notification)
+                    await self._handle_batch(batch)
                 except Exception:
-                    logging.exception("Failed to send contract notification")
+                    logging.exception("Failed to send contract notifications")
 
-        async def _handle_notification(
-            self, notification: ContractNotification
+        async def _handle_batch(
+            self, batch: List[ContractNotification]
         ) -> None:
             if self.contracts_channel_id is None:
                 logging.info(
                     "Discord notification suppressed (contracts_channel_id not configured)"
                 )
                 return
-            channel = self.get_channel(self.contracts_channel_id)
+            channel = self._contracts_channel
             if channel is None:
-                logging.warning(
-                    "Discord channel %s not found", self.contracts_channel_id
-                )
-                return
+                channel = self.get_channel(self.contracts_channel_id)
+                if channel is None:
+                    logging.warning(
+                        "Discord channel %s not found", self.contracts_channel_id
+                    )
+                    return
+                self._contracts_channel = channel
+            lines: List[str] = []
+            length = 0
+            for notification in batch:
+                line = self._format_notification(notification)
+                # channel.send rejects messages above 2000 characters.
+                if lines and length + 1 + len(line) > 2000:
+                    await channel.send("\n".join(lines))
+                    lines, length = [], 0
+                lines.append(line)
+                length += len(line) + 1
+            if lines:
+                await channel.send("\n".join(lines))
+            # Admin reviews carry attachments, so they stay one message
+            # per contract – but sent concurrently under the semaphore
+            # instead of strictly one after another.
+            outcomes = await asyncio.gather(
+                *(
+                    self._send_admin_notification_capped(notification)
+                    for notification in batch
+                ),
+                return_exceptions=True,
+            )
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    logging.error(
+                        "Failed to send admin notification: %s", outcome
+                    )
+
+        async def _send_admin_notification_capped(
+            self, notification: ContractNotification
+        ) -> None:
+            async with self._admin_send_sem:
+                await self._send_admin_notification(notification)
+
+        @staticmethod
+        def _format_notification(notification: ContractNotification) -> str:
             mention = (
                 f" <@{notification.discord_user_id}>"
                 if notification.discord_user_id
                 else ""
             )
-            message = (
+            return (
                 f"Создан контракт #{notification.contract_id} на игровое имя {notification.player_name}"
                 f" (система: {notification.system}). Оценка: {notification.est_total:.2f},"
                 f" зачтено в BISK: {notification.bisk_credited:.2f}.{mention}"
             )
-            await channel.send(message)
-            await self._send_admin_notification(notification)
 
         async def _send_admin_notification(
             self, notification: ContractNotification
         ) -> None:
             if self.admin_channel_id is None:
                 return
-            channel = await self._resolve_text_channel(self.admin_channel_id)
+            channel = self._admin_channel
             if channel is None:
-                logging.warning(
-                    "Discord admin channel %s not found", self.admin_channel_id
-                )
-                return
+                channel = await self._resolve_text_channel(self.admin_channel_id)
+                if channel is None:
+                    logging.warning(
+                        "Discord admin channel %s not found", self.admin_channel_id
+                    )
+                    return
+                self._admin_channel = channel
 
-            lines = [
-                f"Контракт #{notification.contract_id} для {notification.player_name} (система {notification.system}).",
-                "Проверьте результаты OCR и подтвердите через /ocr_confirm или исправьте через /ocr_correct.",
-                "Распознанные области:",
-            ]
+            buf = io.StringIO()
+            buf.write(
+                f"Контракт #{notification.contract_id} для {notification.player_name}"
+                f" (система {notification.system}).\n"
+                "Проверьте результаты OCR и подтвердите через /ocr_confirm"
+                " или исправьте через /ocr_correct.\n"
+                "Распознанные области:"
+            )
             for result in notification.ocr_results:
-                coords = ", ".join(str(value) for value in result.coordinates)
+                coords = ", ".join(map(str, result.coordinates))
                 text = result.recognized_text or "<пусто>"
-                lines.append(
-                    f"• {result.box_name}: `{text}` (box: [{coords}])"
-                )
+                buf.write(f"\n• {result.box_name}: `{text}` (box: [{coords}])")
             if not notification.ocr_results:
-                lines.append("• Нет сохранённых OCR результатов")
+                buf.write("\n• Нет сохранённых OCR результатов")
 
+            attachments: List[tuple] = []
+            if notification.screenshot_path:
+                screenshot_path = Path(notification.screenshot_path)
+                if screenshot_path.exists():
+                    attachments.append((screenshot_path, screenshot_path.name))
+            for result in notification.ocr_results:
+                if not result.image_path:
+                    continue
+                crop_path = Path(result.image_path)
+                if crop_path.exists():
+                    attachments.append(
+                        (crop_path, f"{notification.contract_id}_{crop_path.name}")
+                    )
+            # Read the attachments concurrently in worker threads instead
+            # of letting discord.py block the loop on serial file reads.
+            datas = await asyncio.gather(
+                *(
+                    asyncio.to_thread(path.read_bytes)
+                    for path, _ in attachments
+                ),
+                return_exceptions=True,
+            )
             files: List[discord.File] = []
-            handles: List = []
-            try:
-                if notification.screenshot_path:
-                    screenshot_path = Path(notification.screenshot_path)
-                    if screenshot_path.exists():
-                        handle = screenshot_path.open("rb")
-                        handles.append(handle)
-                        files.append(
-                            discord.File(
-                                handle, filename=screenshot_path.name, spoiler=False
-                            )
-                        )
-                for result in notification.ocr_results:
-                    if not result.image_path:
-                        continue
-                    crop_path = Path(result.image_path)
-                    if not crop_path.exists():
-                        continue
-                    handle = crop_path.open("rb")
-                    handles.append(handle)
-                    files.append(
-                        discord.File(handle, filename=f"{notification.contract_id}_{crop_path.name}")
+            for (path, filename), data in zip(attachments, datas):
+                if isinstance(data, BaseException):
+                    logging.warning(
+                        "Failed to read notification attachment %s: %s", path, data
                     )
-                await channel.send("\n".join(lines), files=files)
-            finally:
-                for handle in handles:
-                    handle.close()
+                    continue
+                files.append(discord.File(io.BytesIO(data), filename=filename))
+            await channel.send(buf.getvalue(), files=files)
 
         async def _resolve_text_channel(
             self, channel_id: Optional[int]
@@ -357,7 +461,9 @@ else:
         def _extract_training_words(
             self, texts: Iterable[str]
         ) -> List[str]:
-            words: List[str] = []
-            for text in texts:
-                words.extend(re.findall(r"[\w\-']+", text, re.UNICODE))
-            return words
+            return [
+                word
+                for text in texts
+                for token in text.split()
+                if (word := token.strip(_TRAINING_WORD_PUNCT))
+            ]
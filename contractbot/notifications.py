@@ -2,11 +2,17 @@
 from __future__ import annotations
 
 import dataclasses
+import sys
 from dataclasses import dataclass
 from typing import Optional, Sequence, Tuple
 
+# slots=True halves the per-instance footprint of OcrResult (created per
+# OCR box, dozens per contract burst) but only exists from Python 3.10;
+# 3.9 installs keep the plain dataclass.
+_SLOTS_KW = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, **_SLOTS_KW)
 class OcrResult:
     """Represents OCR output for a specific named box."""
 
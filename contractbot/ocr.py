@@ -1,9 +1,16 @@
 """OCR helpers backed by ``pytesseract``."""
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Sequence
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from .utils import optional_int
 
 try:  # pragma: no cover - optional dependency guards
     import pytesseract
@@ -12,6 +19,51 @@ except ImportError:  # pragma: no cover - runtime guard
     pytesseract = None  # type: ignore[assignment]
     Image = None  # type: ignore[assignment]
 
+try:  # pragma: no cover - optional dependency guards
+    import tesserocr
+except ImportError:  # pragma: no cover - runtime guard
+    tesserocr = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency guards
+    import numpy as np
+except ImportError:  # pragma: no cover - runtime guard
+    np = None  # type: ignore[assignment]
+
+
+def box_spec(
+    ocr_boxes: Dict[str, Any], box_name: str
+) -> Tuple[Optional[Sequence[int]], Optional[int], Optional[str]]:
+    """Resolve an ``ocr_boxes`` entry to ``(coords, psm, whitelist)``.
+
+    An entry is either the legacy ``[left, top, right, bottom]`` sequence
+    or a mapping with a ``"box"`` key plus optional recognition hints:
+    ``"psm"`` (page segmentation mode; 7 skips layout analysis for
+    single-line boxes) and ``"whitelist"`` (restricts the character set,
+    which both speeds up and stabilises recognition of e.g. timestamps).
+    """
+
+    entry = ocr_boxes.get(box_name)
+    if entry is None:
+        return None, None, None
+    if isinstance(entry, dict):
+        whitelist = entry.get("whitelist")
+        return entry.get("box"), optional_int(entry.get("psm")), whitelist or None
+    return entry, None, None
+
+
+@functools.lru_cache(maxsize=None)
+def shared_engine(lang: str, tesseract_cmd: Optional[str]) -> "OcrEngine":
+    """Return the process-wide :class:`OcrEngine` for this configuration.
+
+    Every OcrEngine probes the tesseract binary and (with tesserocr)
+    loads the language model, so independently constructed instances pay
+    that cost repeatedly.  Callers that don't need a private engine
+    should obtain it here so the worker pool and resident API are shared
+    across the whole process.
+    """
+
+    return OcrEngine(lang, tesseract_cmd)
+
 
 class OcrEngine:
     """Wrapper around :mod:`pytesseract` with safe cropping helpers."""
@@ -20,6 +72,12 @@ class OcrEngine:
         self.lang = lang
         self.training_dir = Path("training")
         self.user_words_file = self.training_dir / f"{self.lang}.user-words"
+        # Each image_to_string call forks a tesseract process; the pool
+        # both parallelises multi-box OCR and caps how many of those
+        # processes can run at once.
+        self._pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 2, thread_name_prefix="ocr"
+        )
         if pytesseract is not None:
             if tesseract_cmd:
                 pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
@@ -28,53 +86,241 @@ class OcrEngine:
                 self.user_words_file.touch()
         else:
             logging.warning("pytesseract is not available – OCR will fail")
+        # tesserocr keeps the language model resident in-process, so each
+        # recognition skips the fork plus the ~10-40 MB model reload that
+        # pytesseract pays per call.  The API object is not thread-safe,
+        # hence the lock; even serialised it is far cheaper than exec.
+        self._api = None
+        self._api_lock = threading.Lock()
+        # Single-slot cache for the numpy conversion of the screenshot
+        # being processed; one contract extracts many boxes from the same
+        # image, and this makes the pixel conversion happen once for all
+        # of them.  Stored as one (image, array) tuple so pool workers
+        # can never observe the source image paired with a stale array;
+        # the lone attribute assignment publishes both atomically.
+        self._arr_cache: Optional[Tuple["Image.Image", "np.ndarray"]] = None
+        if tesserocr is not None:
+            try:
+                self._api = tesserocr.PyTessBaseAPI(lang=self.lang)
+                if self.user_words_file.exists():
+                    self._api.SetVariable(
+                        "user_words_file", str(self.user_words_file)
+                    )
+            except Exception:
+                logging.exception(
+                    "Failed to initialise tesserocr – falling back to pytesseract"
+                )
+                self._api = None
 
     def extract_text(
         self,
         image: "Image.Image",
         box_name: str,
-        ocr_boxes: Dict[str, Sequence[int]],
+        ocr_boxes: Dict[str, Any],
         psm: int = 6,
     ) -> str:
-        box = ocr_boxes.get(box_name)
+        box, box_psm, whitelist = box_spec(ocr_boxes, box_name)
         if not box:
             logging.warning("OCR box '%s' not configured", box_name)
             return ""
+        # A per-box psm hint from the config is more specific than the
+        # caller's default.
+        if box_psm is not None:
+            psm = box_psm
         cropped = self._safe_crop(image, box)
         if cropped is None:
             return ""
+        text = self.recognize(cropped, psm=psm, whitelist=whitelist)
+        logging.debug("OCR result for box %s: %s", box_name, text)
+        return text
+
+    def recognize(
+        self,
+        cropped: "Image.Image",
+        psm: int = 6,
+        whitelist: Optional[str] = None,
+    ) -> str:
+        """OCR an already-cropped image.
+
+        Callers that hold a crop (e.g. because they hashed it for a
+        cache lookup or will save it as an artifact) use this directly so
+        the pixels are sliced out of the screenshot exactly once.
+        """
+
+        if self._api is not None:
+            with self._api_lock:
+                # Always (re)set the whitelist so a constrained box does
+                # not leak its character set into the next call on the
+                # resident API.
+                self._api.SetVariable(
+                    "tessedit_char_whitelist", whitelist or ""
+                )
+                self._api.SetPageSegMode(psm)
+                self._api.SetImage(cropped)
+                text = self._api.GetUTF8Text()
+            return text.strip()
         if pytesseract is None:
             raise RuntimeError("pytesseract not installed")
         custom = f"--psm {psm}"
+        if whitelist:
+            custom += f" -c tessedit_char_whitelist={whitelist}"
         if self.user_words_file.exists():
             custom += f" --user-words {self.user_words_file}"
         text = pytesseract.image_to_string(cropped, lang=self.lang, config=custom)
-        logging.debug("OCR result for box %s: %s", box_name, text.strip())
         return text.strip()
 
+    async def extract_text_async(
+        self,
+        image: "Image.Image",
+        box_name: str,
+        ocr_boxes: Dict[str, Any],
+        psm: int = 6,
+    ) -> str:
+        """Run :meth:`extract_text` on the OCR pool without blocking the loop.
+
+        The synchronous path blocks on a tesseract subprocess, which would
+        stall every other coroutine (and Discord's 3-second interaction
+        deadline) if awaited inline.  Callers can gather several boxes to
+        OCR them concurrently.
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool,
+            functools.partial(
+                self.extract_text, image, box_name, ocr_boxes, psm=psm
+            ),
+        )
+
     def extract_any_text(
         self,
         image: "Image.Image",
         box_name: str,
-        ocr_boxes: Dict[str, Sequence[int]],
+        ocr_boxes: Dict[str, Any],
         psm: int = 6,
     ) -> bool:
         text = self.extract_text(image, box_name, ocr_boxes, psm=psm)
         return bool(text.strip())
 
+    @staticmethod
+    def boxes_by_area(
+        ocr_boxes: Dict[str, Any],
+        box_names: Optional[Sequence[str]] = None,
+    ) -> Sequence[str]:
+        """Return box names ordered by ascending crop area.
+
+        When several boxes are OCR'd concurrently (gathered
+        :meth:`extract_text_async` calls), submitting the smallest crops
+        first lets them finish while the largest is still running, so the
+        fan-out's wall clock is bounded by the biggest box rather than
+        queueing behind it.
+        """
+
+        names = list(box_names) if box_names is not None else list(ocr_boxes)
+
+        def area(name: str) -> int:
+            box, _, _ = box_spec(ocr_boxes, name)
+            if not box or len(box) < 4:
+                return 0
+            left, top, right, bottom = box[:4]
+            return abs((int(right) - int(left)) * (int(bottom) - int(top)))
+
+        return sorted(names, key=area)
+
+    def extract_all(
+        self,
+        image: "Image.Image",
+        ocr_boxes: Dict[str, Any],
+        box_names: Optional[Sequence[str]] = None,
+        psm: int = 6,
+    ) -> Dict[str, str]:
+        """OCR several boxes with a single tesseract invocation.
+
+        Per-box :meth:`extract_text` calls each fork a tesseract process,
+        and ~100-300 ms of startup per box dominates small crops.  This
+        pastes the crops onto one vertically stacked composite, runs one
+        ``image_to_data`` pass, and buckets the recognised words back to
+        their source box by y-range.
+        """
+
+        if pytesseract is None:
+            raise RuntimeError("pytesseract not installed")
+        names = list(box_names) if box_names is not None else list(ocr_boxes)
+        results: Dict[str, str] = {name: "" for name in names}
+        crops = []
+        for name in names:
+            box, _, _ = box_spec(ocr_boxes, name)
+            if not box:
+                logging.warning("OCR box '%s' not configured", name)
+                continue
+            cropped = self._safe_crop(image, box)
+            if cropped is not None:
+                crops.append((name, cropped))
+        if not crops:
+            return results
+
+        # Generous padding between crops so tesseract never merges words
+        # from adjacent boxes into one line.
+        pad = 16
+        width = max(crop.width for _, crop in crops)
+        height = sum(crop.height + pad for _, crop in crops) - pad
+        composite = Image.new("RGB", (width, height), "white")
+        spans = []
+        offset = 0
+        for name, crop in crops:
+            composite.paste(crop, (0, offset))
+            spans.append((name, offset, offset + crop.height))
+            offset += crop.height + pad
+
+        custom = f"--psm {psm}"
+        if self.user_words_file.exists():
+            custom += f" --user-words {self.user_words_file}"
+        data = pytesseract.image_to_data(
+            composite,
+            lang=self.lang,
+            config=custom,
+            output_type=pytesseract.Output.DICT,
+        )
+
+        buckets: Dict[str, list] = {name: [] for name, _, _ in spans}
+        for i, word in enumerate(data["text"]):
+            word = word.strip()
+            if not word:
+                continue
+            mid = data["top"][i] + data["height"][i] / 2
+            for name, y0, y1 in spans:
+                if y0 <= mid < y1:
+                    line_key = (
+                        data["block_num"][i],
+                        data["par_num"][i],
+                        data["line_num"][i],
+                    )
+                    buckets[name].append((line_key, word))
+                    break
+        for name, words in buckets.items():
+            lines: list = []
+            previous_key = None
+            for line_key, word in words:
+                if line_key != previous_key:
+                    lines.append([])
+                    previous_key = line_key
+                lines[-1].append(word)
+            results[name] = "\n".join(" ".join(line) for line in lines)
+        return results
+
     def extract_table(
         self,
         image: "Image.Image",
         box_name: str,
-        ocr_boxes: Dict[str, Sequence[int]],
+        ocr_boxes: Dict[str, Any],
         psm: int = 6,
     ) -> str:
         return self.extract_text(image, box_name, ocr_boxes, psm=psm)
 
     def crop_box(
-        self, image: "Image.Image", box_name: str, ocr_boxes: Dict[str, Sequence[int]]
+        self, image: "Image.Image", box_name: str, ocr_boxes: Dict[str, Any]
     ) -> Optional["Image.Image"]:
-        box = ocr_boxes.get(box_name)
+        box, _, _ = box_spec(ocr_boxes, box_name)
         if not box:
             logging.warning("OCR box '%s' not configured", box_name)
             return None
@@ -83,35 +329,22 @@ class OcrEngine:
     def add_training_words(self, words: Iterable[str]) -> None:
         """Persist ``words`` to the user words file for incremental training."""
 
-        unique_words = []
-        seen = set()
-        for word in words:
-            word = word.strip()
-            if not word:
-                continue
-            if word in seen:
-                continue
-            seen.add(word)
-            unique_words.append(word)
-
-        if not unique_words:
+        incoming = {word.strip() for word in words if word and word.strip()}
+        if not incoming:
             return
 
         try:
-            existing = set()
-            if self.user_words_file.exists():
-                with self.user_words_file.open("r", encoding="utf-8") as fh:
-                    for line in fh:
-                        line = line.strip()
-                        if line:
-                            existing.add(line)
-            new_words = [word for word in unique_words if word not in existing]
+            existing = (
+                set(self.user_words_file.read_text(encoding="utf-8").split())
+                if self.user_words_file.exists()
+                else set()
+            )
+            new_words = incoming - existing
             if not new_words:
                 return
             self.training_dir.mkdir(parents=True, exist_ok=True)
             with self.user_words_file.open("a", encoding="utf-8") as fh:
-                for word in new_words:
-                    fh.write(f"{word}\n")
+                fh.write("\n".join(new_words) + "\n")
             logging.info("Added %s new OCR training words", len(new_words))
         except Exception:
             logging.exception("Failed to append OCR training words")
@@ -141,4 +374,17 @@ class OcrEngine:
                 height,
             )
             return None
+        if np is not None:
+            # Slice the cached numpy conversion instead of Image.crop:
+            # the slice is an O(1) view and only the boundary
+            # Image.fromarray copies crop-sized pixels, while the full
+            # image is converted once per screenshot.  Snapshot the slot
+            # into a local so a concurrent refresh cannot swap it out
+            # between the identity check and the slice; a miss computes
+            # the array fully before publishing the new pair.
+            cache = self._arr_cache
+            if cache is None or cache[0] is not image:
+                cache = (image, np.asarray(image))
+                self._arr_cache = cache
+            return Image.fromarray(cache[1][top:bottom, left:right])
         return image.crop((left, top, right, bottom))
@@ -1,6 +1,7 @@
 """Parsing helpers for extracting structured information."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import platform
 import re
@@ -8,11 +9,63 @@ import subprocess
 from dataclasses import dataclass
 from typing import List, Optional, Sequence
 
-LINE_REGEX = re.compile(r"^\d+\s+.+?\s+[\d\.,]+\s+[\d\.,]+$")
+#: One composition row: index, item name, quantity, estimated value.
+#: A single match extracts all fields, replacing the old match-then-split
+#: double pass over every line.
+_ROW_RE = re.compile(
+    r"^\s*\d+\s+(?P<name>.+?)\s+(?P<qty>[\d.,]+)\s+(?P<est>[\d.,]+)\s*$"
+)
 SANITIZE_REGEX = re.compile(
     "[^0-9A-Za-zА-Яа-яЁё\\-_'\"()\\[\\]{}.,:;!? ]+"
 )
-MULTISPACE_REGEX = re.compile(r"\s{2,}")
+_WS_RE = re.compile(r"\s+")
+
+
+#: Cached at import so clipboard dispatch is one comparison, not a
+#: platform.system() call per read.
+_PLATFORM = platform.system().lower()
+
+
+def _clipboard_native() -> Optional[str]:
+    """Read the clipboard through an in-process OS API where one exists.
+
+    On Windows this goes straight to user32 via ctypes instead of
+    spawning PowerShell, turning a multi-hundred-millisecond fork into a
+    few syscalls.  Platforms without a dependable in-process API return
+    ``None`` and the caller falls back to the helper-binary path.
+    """
+
+    if _PLATFORM != "windows":
+        return None
+    import ctypes
+
+    CF_UNICODETEXT = 13
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    # ctypes defaults every restype to c_int, which truncates 64-bit
+    # HANDLEs/pointers on Win64 and would make c_wchar_p dereference a
+    # garbage address; declare the real signatures before calling.
+    user32.GetClipboardData.restype = ctypes.c_void_p
+    user32.GetClipboardData.argtypes = (ctypes.c_uint,)
+    kernel32.GlobalLock.restype = ctypes.c_void_p
+    kernel32.GlobalLock.argtypes = (ctypes.c_void_p,)
+    kernel32.GlobalUnlock.restype = ctypes.c_int
+    kernel32.GlobalUnlock.argtypes = (ctypes.c_void_p,)
+    if not user32.OpenClipboard(None):
+        return None
+    try:
+        handle = user32.GetClipboardData(CF_UNICODETEXT)
+        if not handle:
+            return None
+        pointer = kernel32.GlobalLock(handle)
+        if not pointer:
+            return None
+        try:
+            return ctypes.c_wchar_p(pointer).value
+        finally:
+            kernel32.GlobalUnlock(handle)
+    finally:
+        user32.CloseClipboard()
 
 
 @dataclass
@@ -24,13 +77,14 @@ class ContractItem:
 
 def sanitize_item_name(name: str) -> str:
     cleaned = SANITIZE_REGEX.sub(" ", name)
-    return re.sub(r"\s+", " ", cleaned).strip()
+    return _WS_RE.sub(" ", cleaned).strip()
 
 
 def extract_nick(raw: str) -> str:
-    if "--->" in raw:
-        return raw.split("--->", 1)[0].strip()
-    return raw.strip()
+    # partition scans the string once and never allocates a list; with
+    # no separator it returns the whole string as the head, so the two
+    # branches of the old "in"+split form collapse into one.
+    return raw.partition("--->")[0].strip()
 
 
 def extract_system(raw: str) -> str:
@@ -46,23 +100,14 @@ class CompositionParser:
 
     def parse_lines(self, text: str) -> List[ContractItem]:
         items: List[ContractItem] = []
-        for raw_line in text.splitlines():
-            line = raw_line.strip()
-            if not line:
-                continue
-            if not LINE_REGEX.match(line):
-                parts = [part for part in MULTISPACE_REGEX.split(line) if part]
-            else:
-                parts = line.split()
-            if len(parts) < 4:
+        for line in text.splitlines():
+            match = _ROW_RE.match(line)
+            if not match:
                 continue
-            qty_raw = parts[-2]
-            est_raw = parts[-1]
-            name_parts = parts[1:-2]
-            name = sanitize_item_name(" ".join(name_parts))
+            name = sanitize_item_name(match.group("name"))
             try:
-                quantity = float(qty_raw.replace(",", "."))
-                est_value = float(est_raw.replace(",", "."))
+                quantity = float(match.group("qty").replace(",", "."))
+                est_value = float(match.group("est").replace(",", "."))
             except ValueError:
                 logging.debug("Failed to parse numeric values in line: %s", line)
                 continue
@@ -73,7 +118,8 @@ class CompositionParser:
             )
         return items
 
-    def read_host_clipboard(self) -> Optional[str]:
+    @staticmethod
+    def _clipboard_commands() -> List[Sequence[str]]:
         system = platform.system().lower()
         commands: List[Sequence[str]] = []
         if system == "windows":
@@ -83,7 +129,27 @@ class CompositionParser:
         else:  # Linux/BSD
             commands.append(["xclip", "-selection", "clipboard", "-o"])
             commands.append(["xsel", "--clipboard", "--output"])
-        for cmd in commands:
+        return commands
+
+    @staticmethod
+    def _read_clipboard_native() -> Optional[str]:
+        try:
+            text = _clipboard_native()
+        except Exception:
+            logging.debug("Native clipboard read failed", exc_info=True)
+            return None
+        if text and text.strip():
+            logging.debug(
+                "Obtained host clipboard text natively (%d chars)", len(text)
+            )
+            return text.strip()
+        return None
+
+    def read_host_clipboard(self) -> Optional[str]:
+        text = self._read_clipboard_native()
+        if text is not None:
+            return text
+        for cmd in self._clipboard_commands():
             try:
                 result = subprocess.run(
                     cmd,
@@ -100,6 +166,35 @@ class CompositionParser:
                 return text
         return None
 
+    async def read_host_clipboard_async(self) -> Optional[str]:
+        """Non-blocking variant of :meth:`read_host_clipboard`.
+
+        The synchronous path forks and waits inline, which would freeze an
+        event loop for the whole helper run (a PowerShell start alone is
+        hundreds of milliseconds); this one awaits the subprocess instead.
+        """
+
+        text = self._read_clipboard_native()
+        if text is not None:
+            return text
+        for cmd in self._clipboard_commands():
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+            except FileNotFoundError:
+                continue
+            stdout, _ = await proc.communicate()
+            if proc.returncode != 0:
+                continue
+            text = stdout.decode("utf-8", errors="replace").strip()
+            if text:
+                logging.debug("Obtained host clipboard text (%d chars)", len(text))
+                return text
+        return None
+
     def parse_clipboards(
         self,
         adb_clipboard: Optional[str],
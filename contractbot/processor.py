@@ -1,20 +1,26 @@
 """Automation loop that processes contracts."""
 from __future__ import annotations
 
+import hashlib
 import logging
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .adb import ADBClient
 from .buyback import BuybackManager
 from .config import Config
 from .database import Database
 from .notifications import ContractNotification, OcrResult
-from .ocr import OcrEngine
+from .ocr import OcrEngine, box_spec
 from .parsing import CompositionParser, extract_nick, extract_system
 
+#: Upper bound for the pixel-hash OCR cache below.
+_OCR_CACHE_CAP = 512
+
 
 class ContractProcessor:
     def __init__(
@@ -36,6 +42,38 @@ class ContractProcessor:
         self.notification_callback = notification_callback
         self._stop_event = threading.Event()
         self.artifacts_root = Path("artifacts")
+        # Marker/system/player regions often render identically between
+        # polls, so OCR results are cached by a hash of the crop's raw
+        # pixels: an unchanged region costs a hash plus a dict lookup
+        # instead of a 50-250 ms tesseract run.  The composition table
+        # changes per contract and bypasses the cache.
+        self._ocr_cache: "OrderedDict[Tuple[str, bytes], str]" = OrderedDict()
+        self._ocr_cache_lock = threading.Lock()
+        # The header boxes are independent functions of the same
+        # screenshot and tesseract releases the GIL in its C call, so
+        # recognising them on a small pool bounds the wall clock by the
+        # slowest box instead of the sum.
+        self._ocr_pool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="ocr-box"
+        )
+        # Step programs and the box table are fixed for the processor's
+        # lifetime; binding them here removes the per-cycle attribute and
+        # method lookups and yields stable tuples (empty ones included),
+        # so execute_steps short-circuits cheaply on absent macros.
+        self._steps: Dict[str, tuple] = {
+            name: config.ui_steps(name)
+            for name in (
+                "open_contracts_steps",
+                "close_contracts_window",
+                "first_contract_tap",
+                "swipe_to_composition",
+                "composition_fixed_tap",
+                "copy_sequence",
+                "close_contract_card",
+                "accept_contract",
+            )
+        }
+        self._boxes = config.ocr_boxes
 
     def stop(self) -> None:
         self._stop_event.set()
@@ -51,64 +89,94 @@ class ContractProcessor:
                 logging.exception("Unexpected error in contract processing loop")
                 time.sleep(poll_interval)
 
+    def _cached_ocr(
+        self,
+        screenshot: "Image.Image",
+        box_name: str,
+        psm: int = 6,
+        crops: Optional[Dict[str, "Image.Image"]] = None,
+    ) -> str:
+        crop = self.ocr.crop_box(screenshot, box_name, self._boxes)
+        if crop is None:
+            return ""
+        if crops is not None:
+            # The crop is already in hand for the hash below; depositing
+            # it lets _persist_ocr_artifacts reuse it instead of slicing
+            # the screenshot a second time.
+            crops[box_name] = crop
+        key = (
+            box_name,
+            hashlib.blake2b(crop.tobytes(), digest_size=8).digest(),
+        )
+        with self._ocr_cache_lock:
+            cached = self._ocr_cache.get(key)
+            if cached is not None:
+                self._ocr_cache.move_to_end(key)
+                return cached
+        _, box_psm, whitelist = box_spec(self._boxes, box_name)
+        text = self.ocr.recognize(
+            crop,
+            psm=box_psm if box_psm is not None else psm,
+            whitelist=whitelist,
+        )
+        with self._ocr_cache_lock:
+            self._ocr_cache[key] = text
+            if len(self._ocr_cache) > _OCR_CACHE_CAP:
+                self._ocr_cache.popitem(last=False)
+        return text
+
     def _process_cycle(self, poll_interval: float, cooldown: float) -> None:
         self._apply_pending_training()
-        self.adb.execute_steps(self.config.ui.get("open_contracts_steps", []))
+        self.adb.execute_steps(self._steps["open_contracts_steps"])
         screenshot = self.adb.screencap()
         if screenshot is None:
             logging.error("Failed to obtain screenshot – skipping cycle")
             return
-        has_contract = self.ocr.extract_any_text(
-            screenshot,
-            "contracts_marker",
-            self.config.ocr_boxes,
+        has_contract = bool(
+            self._cached_ocr(screenshot, "contracts_marker").strip()
         )
         if not has_contract:
             logging.info("No contract detected; closing window and sleeping")
             self.adb.execute_steps(
-                self.config.ui.get("close_contracts_window", [])
+                self._steps["close_contracts_window"]
             )
             time.sleep(poll_interval)
             return
 
         logging.info("Contract marker detected – processing first contract")
-        self.adb.execute_steps(self.config.ui.get("first_contract_tap", []))
+        self.adb.execute_steps(self._steps["first_contract_tap"])
         time.sleep(0.5)
         contract_screenshot = self.adb.screencap()
         if contract_screenshot is None:
             logging.error("Failed to capture contract screenshot")
             return
+        # screencap() returns a view over the client's shared capture
+        # buffer, valid only until the next capture.  This frame outlives
+        # the OCR-fallback screencap below (header futures still read it
+        # and _persist_ocr_artifacts saves it), so detach it from the
+        # buffer now.
+        contract_screenshot = contract_screenshot.copy()
         screenshot = contract_screenshot
 
         ocr_texts: Dict[str, str] = {}
-        system_text = self.ocr.extract_text(
-            screenshot, "system", self.config.ocr_boxes
-        )
-        ocr_texts["system"] = system_text
-        player_text = self.ocr.extract_text(
-            screenshot, "player_name", self.config.ocr_boxes
-        )
-        ocr_texts["player_name"] = player_text
-        game_time_text = self.ocr.extract_text(
-            screenshot, "game_time", self.config.ocr_boxes
-        )
-        ocr_texts["game_time"] = game_time_text
-        logging.info(
-            "OCR extracted system='%s', player='%s', time='%s'",
-            system_text,
-            player_text,
-            game_time_text,
-        )
-
-        system_name = extract_system(system_text)
-        player_name = extract_nick(player_text)
-        logging.debug(
-            "Normalised system='%s', player='%s'", system_name, player_name
-        )
-
-        self.adb.execute_steps(self.config.ui.get("swipe_to_composition", []))
-        self.adb.execute_steps(self.config.ui.get("composition_fixed_tap", []))
-        copy_sequence = self.config.ui.get("copy_sequence", [])
+        ocr_crops: Dict[str, "Image.Image"] = {}
+        header_boxes = ("system", "player_name", "game_time")
+        # Submit smallest crops first (see OcrEngine.boxes_by_area) so
+        # they finish while the largest is still being recognised.
+        futures = {
+            name: self._ocr_pool.submit(
+                self._cached_ocr, screenshot, name, crops=ocr_crops
+            )
+            for name in self.ocr.boxes_by_area(
+                self._boxes, header_boxes
+            )
+        }
+        # The header futures are collected only after the swipe/copy
+        # steps below: the device-side dwell absorbs the OCR work, so in
+        # steady state the recognition is free.
+        self.adb.execute_steps(self._steps["swipe_to_composition"])
+        self.adb.execute_steps(self._steps["composition_fixed_tap"])
+        copy_sequence = self._steps["copy_sequence"]
         if copy_sequence:
             self.adb.execute_steps(copy_sequence)
         time.sleep(4)
@@ -128,7 +196,7 @@ class ContractProcessor:
                 ocr_text = self.ocr.extract_table(
                     composition_screenshot,
                     "composition_table",
-                    self.config.ocr_boxes,
+                    self._boxes,
                     psm=6,
                 )
                 if ocr_text:
@@ -139,14 +207,31 @@ class ContractProcessor:
             logging.warning(
                 "Failed to parse composition; skipping contract acceptance"
             )
-            self.adb.execute_steps(self.config.ui.get("close_contract_card", []))
-            self.adb.execute_steps(self.config.ui.get("close_contracts_window", []))
+            self.adb.execute_steps(self._steps["close_contract_card"])
+            self.adb.execute_steps(self._steps["close_contracts_window"])
             time.sleep(poll_interval)
             return
 
+        for name in header_boxes:
+            ocr_texts[name] = futures[name].result()
+        system_text = ocr_texts["system"]
+        player_text = ocr_texts["player_name"]
+        logging.info(
+            "OCR extracted system='%s', player='%s', time='%s'",
+            system_text,
+            player_text,
+            ocr_texts["game_time"],
+        )
+
+        system_name = extract_system(system_text)
+        player_name = extract_nick(player_text)
+        logging.debug(
+            "Normalised system='%s', player='%s'", system_name, player_name
+        )
+
         buyback_percent = self.buyback_manager.percent
         user_id = self.db.get_user_by_character(player_name)
-        contract_id, est_total, bisk_credited = self.db.record_contract(
+        contract_id, est_total, bisk_credited, discord_id = self.db.record_contract(
             system=system_name,
             player_name=player_name,
             buyback_percent=buyback_percent,
@@ -156,16 +241,26 @@ class ContractProcessor:
 
         screenshot_path: Optional[str] = None
         ocr_results: Sequence[OcrResult] = ()
-        try:
-            screenshot_path, ocr_results = self._persist_ocr_artifacts(
-                contract_id, contract_screenshot, ocr_texts
-            )
-        except Exception:
-            logging.exception("Failed to persist OCR artifacts for contract %s", contract_id)
+        # "errors_only" keeps artifacts only when the clipboard parse
+        # failed and the OCR fallback actually ran – the cases an admin
+        # would want to review.
+        mode = self.config.artifacts_mode
+        persist_artifacts = mode != "none" and (
+            mode != "errors_only" or "composition_table" in ocr_texts
+        )
+        if persist_artifacts:
+            try:
+                screenshot_path, ocr_results = self._persist_ocr_artifacts(
+                    contract_id, contract_screenshot, ocr_texts, ocr_crops
+                )
+            except Exception:
+                logging.exception(
+                    "Failed to persist OCR artifacts for contract %s", contract_id
+                )
 
-        self.adb.execute_steps(self.config.ui.get("close_contract_card", []))
-        self.adb.execute_steps(self.config.ui.get("accept_contract", []))
-        self.adb.execute_steps(self.config.ui.get("close_contracts_window", []))
+        self.adb.execute_steps(self._steps["close_contract_card"])
+        self.adb.execute_steps(self._steps["accept_contract"])
+        self.adb.execute_steps(self._steps["close_contracts_window"])
         logging.info(
             "Completed contract #%s processing, entering cooldown", contract_id
         )
@@ -180,7 +275,7 @@ class ContractProcessor:
                         system=system_name,
                         est_total=est_total,
                         bisk_credited=bisk_credited,
-                        discord_user_id=self._resolve_discord_id(user_id),
+                        discord_user_id=discord_id,
                         ocr_results=ocr_results,
                         screenshot_path=screenshot_path,
                     )
@@ -193,31 +288,55 @@ class ContractProcessor:
         contract_id: int,
         screenshot: "Image.Image",
         ocr_texts: Dict[str, str],
+        crops: Optional[Dict[str, "Image.Image"]] = None,
     ) -> tuple[Optional[str], Sequence[OcrResult]]:
         artifacts_dir = self.artifacts_root / "contracts" / f"{contract_id:06d}"
         artifacts_dir.mkdir(parents=True, exist_ok=True)
         screenshot_path: Optional[Path] = None
         try:
             screenshot_path = artifacts_dir / "contract.png"
-            screenshot.save(screenshot_path)
+            # compress_level=1 quarters the zlib time of the default (6)
+            # for a few percent larger file – these are review artifacts,
+            # not archives.
+            screenshot.save(screenshot_path, compress_level=1)
         except Exception:
             logging.exception("Failed to save contract screenshot for #%s", contract_id)
             screenshot_path = None
 
         ocr_results: List[OcrResult] = []
+        samples: List[tuple] = []
         for box_name, text in ocr_texts.items():
-            box = self.config.ocr_boxes.get(box_name)
+            box, _, _ = box_spec(self._boxes, box_name)
             if not box or len(box) < 4:
                 logging.warning(
                     "Skipping OCR artifact for '%s' due to missing/invalid box", box_name
                 )
                 continue
             crop_path: Optional[Path] = None
-            cropped = self.ocr.crop_box(screenshot, box_name, self.config.ocr_boxes)
+            # Reuse the crop taken for recognition when available (the
+            # composition table is OCR'd from a later capture, so it is
+            # still cropped here).
+            cropped = crops.get(box_name) if crops else None
+            if cropped is None:
+                cropped = self.ocr.crop_box(screenshot, box_name, self._boxes)
             if cropped is not None:
-                crop_path = artifacts_dir / f"{box_name}.png"
+                # Crops exist for human review, so lossy JPEG (several
+                # times faster to encode and smaller on disk than PNG)
+                # is fine; boxes flagged as training samples keep the
+                # lossless PNG form.
+                entry = self._boxes.get(box_name)
+                training = isinstance(entry, dict) and bool(
+                    entry.get("training_sample")
+                )
                 try:
-                    cropped.save(crop_path)
+                    if training:
+                        crop_path = artifacts_dir / f"{box_name}.png"
+                        cropped.save(crop_path, compress_level=1)
+                    else:
+                        crop_path = artifacts_dir / f"{box_name}.jpg"
+                        if cropped.mode not in ("RGB", "L"):
+                            cropped = cropped.convert("RGB")
+                        cropped.save(crop_path, quality=85)
                 except Exception:
                     logging.exception(
                         "Failed to save OCR crop '%s' for contract %s",
@@ -225,12 +344,8 @@ class ContractProcessor:
                         contract_id,
                     )
                     crop_path = None
-            self.db.store_ocr_sample(
-                contract_id=contract_id,
-                box_name=box_name,
-                box=box,
-                recognized_text=text,
-                image_path=str(crop_path) if crop_path else None,
+            samples.append(
+                (box_name, box, text, str(crop_path) if crop_path else None)
             )
             ocr_results.append(
                 OcrResult(
@@ -245,6 +360,9 @@ class ContractProcessor:
                     image_path=str(crop_path) if crop_path else None,
                 )
             )
+        # One transaction (and one fsync) for the whole contract instead
+        # of a commit per box.
+        self.db.store_ocr_samples(contract_id, samples)
         return (
             str(screenshot_path) if screenshot_path else None,
             tuple(ocr_results),
@@ -258,15 +376,3 @@ class ContractProcessor:
             self.ocr.add_training_words(words)
         except Exception:
             logging.exception("Failed to append training words to OCR engine")
-
-    def _resolve_discord_id(self, user_id: Optional[int]) -> Optional[int]:
-        if user_id is None:
-            return None
-        cur = self.db._connection.execute(  # using internal connection intentionally
-            "SELECT discord_id FROM users WHERE id = ?",
-            (user_id,),
-        )
-        row = cur.fetchone()
-        if row and row["discord_id"]:
-            return int(row["discord_id"])
-        return None
@@ -9,6 +9,18 @@ def optional_int(value: Any) -> Optional[int]:
 
     if value is None:
         return None
+    # Exact-type fast paths keep the common int/str inputs (DB rows,
+    # JSON config values) out of the exception machinery below.
+    kind = type(value)
+    if kind is int:
+        return value
+    if kind is str:
+        digits = value[1:] if value.startswith("-") else value
+        # isdecimal, not isdigit: the latter also accepts superscripts
+        # and other Unicode digit forms that int() rejects, which would
+        # let a ValueError escape the fast path.
+        if digits.isdecimal():
+            return int(value)
     try:
         return int(value)
     except (TypeError, ValueError):
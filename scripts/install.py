@@ -6,6 +6,7 @@ import argparse
 import os
 import subprocess
 import sys
+import venv
 from pathlib import Path
 from typing import Iterable
 
@@ -22,7 +23,12 @@ def ensure_venv(python_executable: str, venv_path: Path) -> Path:
     """Создать виртуальное окружение, если оно ещё не существует."""
 
     if not venv_path.exists():
-        run([python_executable, "-m", "venv", str(venv_path)])
+        if Path(python_executable).resolve() == Path(sys.executable).resolve():
+            # Текущий интерпретатор совпадает с запрошенным: создаём
+            # окружение в этом же процессе без запуска дочернего Python.
+            venv.EnvBuilder(with_pip=True).create(str(venv_path))
+        else:
+            run([python_executable, "-m", "venv", str(venv_path)])
     return venv_python(venv_path)
 
 
@@ -47,6 +53,9 @@ def venv_python(venv_path: Path) -> Path:
 def install_requirements(python_bin: Path, requirements_file: Path) -> None:
     """Установить зависимости проекта внутрь окружения."""
 
+    # Два отдельных вызова: в совместной команде --upgrade затронул бы и
+    # зависимости из requirements.txt, принудительно обновляя их при
+    # каждом повторном запуске.
     run([str(python_bin), "-m", "pip", "install", "--upgrade", "pip"])
     run([str(python_bin), "-m", "pip", "install", "-r", str(requirements_file)])
 
@@ -46,7 +46,20 @@ def ensure_remote(repo_url: str | None, branch: str) -> None:
                 "Текущая директория не является git-репозиторием. "
                 "Укажите URL репозитория при запуске."
             )
-        run_git(["clone", repo_url, "."])
+        # Частичный неглубокий клон: без истории и блобов старых
+        # ревизий — трафик и место на диске не зависят от возраста
+        # репозитория.
+        run_git(
+            [
+                "clone",
+                "--filter=blob:none",
+                "--depth=1",
+                "--branch",
+                branch,
+                repo_url,
+                ".",
+            ]
+        )
         return
 
     if repo_url:
@@ -62,7 +75,7 @@ def ensure_remote(repo_url: str | None, branch: str) -> None:
             "Удалённый репозиторий origin не настроен. Передайте URL при запуске."
         ) from exc
 
-    run_git(["fetch", "origin", branch])
+    # pull сам выполняет fetch — отдельный сетевой запрос не нужен.
     run_git(["pull", "--rebase", "origin", branch])
 
 